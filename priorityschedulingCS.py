@@ -1,80 +1,28 @@
-import heapq
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+import time
 import uuid
 
-class Process:
-    def __init__(self, pid, arrival_time, burst_time, priority):
-        self.pid = pid
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.remaining_time = burst_time
-        self.priority = priority
-        self.waiting_time = 0
-        self.turnaround_time = 0
-        self.start_time = None
-        self.completion_time = None
+# The cache, export, snapshot and service modules are imported where used,
+# so the interactive menu starts without them
+from schedcore import (MODES, IncrementalScheduler, Process, SimulationStats, Timeline, compute_metrics,
+                       lane_utilization, load_table, overhead_time, policy_for, schedule_table, schedule_table_multi)
 
-    def __lt__(self, other):
-        # Priority Queue: smaller priority value = higher priority
-        return self.priority < other.priority if self.priority != other.priority else self.arrival_time < other.arrival_time
+# Command-line spellings of the scheduling modes, e.g. "round-robin"
+MODE_ARGS = {mode.lower().replace(" ", "-"): mode for mode in MODES}
+# The only modes with multi-CPU, aging and snapshot support
+PRIORITY_MODES = ("Non-Preemptive", "Preemptive")
 
-def calculate_non_preemptive(processes):
-    current_time = 0.0
-    completed = []
-    remaining_processes = processes.copy()
-    
-    while remaining_processes:
-        available = [p for p in remaining_processes if p.arrival_time <= current_time]
-        if not available:
-            next_arrival = min(p.arrival_time for p in remaining_processes)
-            current_time = next_arrival
-            continue
-        current_process = min(available, key=lambda x: x.priority)
-        current_process.waiting_time = current_time - current_process.arrival_time
-        current_process.turnaround_time = current_process.waiting_time + current_process.burst_time
-        current_time += current_process.burst_time
-        current_process.completion_time = current_time  # Set completion time
-        completed.append(current_process)
-        remaining_processes.remove(current_process)
-    
-    processes[:] = completed
-
-def calculate_preemptive(processes):
-    current_time = 0.0
-    completed = []
-    ready_queue = []
-    current_process = None
-    remaining_processes = processes.copy()
-    
-    for process in remaining_processes:
-        process.remaining_time = process.burst_time
-        process.start_time = None
-        process.completion_time = None
-    
-    while len(completed) < len(processes):
-        for proc in remaining_processes[:]:
-            if proc.arrival_time <= current_time:
-                heapq.heappush(ready_queue, proc)
-                remaining_processes.remove(proc)
-        if current_process and current_process.remaining_time > 0:
-            heapq.heappush(ready_queue, current_process)
-        if ready_queue:
-            next_process = heapq.heappop(ready_queue)
-            if next_process.start_time is None:
-                next_process.start_time = current_time
-            next_process.remaining_time -= 1
-            if next_process.remaining_time == 0:
-                next_process.completion_time = current_time + 1.0
-                next_process.turnaround_time = next_process.completion_time - next_process.arrival_time
-                next_process.waiting_time = next_process.turnaround_time - next_process.burst_time
-                completed.append(next_process)
-                current_process = None
-            else:
-                current_process = next_process
-        else:
-            current_process = None
-        current_time += 1.0
-    
-    processes[:] = completed
+CSV_FIELDS = ("trace", "mode", "count", "avg_waiting", "p50_waiting", "p95_waiting", "p99_waiting",
+              "avg_turnaround", "p95_turnaround", "avg_response", "cpu_utilization", "overhead_time",
+              "effective_utilization", "throughput", "makespan", "load_seconds", "schedule_seconds")
+# Extra CSV columns with --stats
+STATS_FIELDS = ("iterations", "pushes", "pops", "queue_seconds", "preemptions", "context_switches",
+                "idle_periods", "idle_time")
 
 def display_results(processes):
     print("\nProcess Results:")
@@ -83,24 +31,47 @@ def display_results(processes):
         completion = p.completion_time if p.completion_time is not None else 0.0
         print(f"{p.pid:<8}{p.arrival_time:<10.1f}{p.burst_time:<8.1f}{p.priority:<10}{p.waiting_time:<10.1f}{p.turnaround_time:<12.1f}{completion:<12.1f}")
     if processes:
-        avg_waiting = sum(p.waiting_time for p in processes) / len(processes)
-        avg_turnaround = sum(p.turnaround_time for p in processes) / len(processes)
-        print(f"\nAverage Waiting Time: {avg_waiting:.2f}")
-        print(f"Average Turnaround Time: {avg_turnaround:.2f}")
+        report = compute_metrics(processes)
+        print(f"\nAverage Waiting Time: {report.avg_waiting:.2f}")
+        print(f"Average Turnaround Time: {report.avg_turnaround:.2f}")
+        print(f"\n{'Metric':<12}{'Mean':<10}{'P50':<10}{'P95':<10}{'P99':<10}{'Max':<10}")
+        for name, stats in (("Waiting", report.waiting), ("Turnaround", report.turnaround), ("Response", report.response)):
+            print(f"{name:<12}{stats['mean']:<10.2f}{stats['p50']:<10.2f}{stats['p95']:<10.2f}{stats['p99']:<10.2f}{stats['max']:<10.2f}")
+        print(f"\nCPU Utilization: {report.cpu_utilization:.1%}")
+        print(f"Throughput: {report.throughput:.3f} processes/unit time")
+        if report.by_priority:
+            print(f"\n{'Priority':<10}{'Count':<8}{'Avg Wait':<10}{'P95 Wait':<10}{'Avg Turnaround':<16}")
+            for priority, stats in report.by_priority.items():
+                print(f"{priority:<10}{stats.count:<8}{stats.avg_waiting:<10.2f}{stats.waiting['p95']:<10.2f}{stats.avg_turnaround:<16.2f}")
 
-def main():
+def main(show_stats=False):
+    # show_stats prints engine instrumentation after every run
     processes = []
+    # One incremental scheduler per mode: after adding processes only the
+    # part of the schedule from the earliest new arrival is simulated again
+    schedulers = {mode: IncrementalScheduler(mode) for mode in MODES}
+    last_mode = None
+    # Options 1-7 keep their original meaning; modes added since are
+    # numbered from 8 on
+    display, clear, about, leave = "4", "5", "6", "7"
+    priority_choices = {"2": "Non-Preemptive", "3": "Preemptive"}
+    others = [mode for mode in MODES if mode not in priority_choices.values()]
+    other_choices = {str(number): mode for number, mode in enumerate(others, start=8)}
+    mode_choices = {**priority_choices, **other_choices}
+    last_choice = str(7 + len(others))
     while True:
         print("\n--- Priority Scheduling Simulator ---")
         print("1. Add Process")
         print("2. Run Non-Preemptive Schedule")
         print("3. Run Preemptive Schedule")
-        print("4. Display Results")
-        print("5. Clear All")
-        print("6. About")
-        print("7. Exit")
+        print(f"{display}. Display Results")
+        print(f"{clear}. Clear All")
+        print(f"{about}. About")
+        print(f"{leave}. Exit")
+        for number, mode in other_choices.items():
+            print(f"{number}. Run {mode} Schedule")
         
-        choice = input("Select an option (1-7): ")
+        choice = input(f"Select an option (1-{last_choice}): ")
         
         if choice == "1":
             pid = input("Process ID (press Enter for auto): ") or str(uuid.uuid4())[:8]
@@ -108,6 +79,9 @@ def main():
                 arrival = float(input("Arrival Time: "))
                 burst = float(input("Burst Time: "))
                 priority = int(input("Priority (lower = higher): "))
+                if not (math.isfinite(arrival) and math.isfinite(burst)):
+                    print("Error: Arrival and burst times must be finite.")
+                    continue
                 if arrival < 0:
                     print("Error: Arrival time must be non-negative.")
                     continue
@@ -122,31 +96,29 @@ def main():
             except ValueError:
                 print("Error: Invalid input. Use numeric values.")
                 
-        elif choice == "2":
-            if not processes:
-                print("Error: No processes to schedule.")
-                continue
-            calculate_non_preemptive(processes)
-            print("Non-Preemptive schedule calculated.")
-            
-        elif choice == "3":
+        elif choice in mode_choices:
             if not processes:
                 print("Error: No processes to schedule.")
                 continue
-            calculate_preemptive(processes)
-            print("Preemptive schedule calculated.")
+            mode = mode_choices[choice]
+            stats = SimulationStats() if show_stats else None
+            processes[:] = schedulers[mode].sync(processes, full=last_mode != mode, stats=stats)
+            last_mode = mode
+            print(f"{mode} schedule calculated.")
+            if stats is not None:
+                print(stats.summary())
             
-        elif choice == "4":
+        elif choice == display:
             if not processes:
                 print("Error: No processes to display.")
                 continue
             display_results(processes)
             
-        elif choice == "5":
+        elif choice == clear:
             processes.clear()
             print("All processes cleared.")
             
-        elif choice == "6":
+        elif choice == about:
             print("\n--- About Priority Scheduling Simulator ---")
             print("Developed by Group #2")
             print("Group Members:")
@@ -156,13 +128,229 @@ def main():
             print("- Copioso, Mark Rainier")
             print("Course: Operating Systems")
             
-        elif choice == "7":
+        elif choice == leave:
             print("Exiting...")
             break
             
         else:
-            print("Invalid option. Please enter a number between 1 and 7.")
+            print(f"Invalid option. Please enter a number between 1 and {last_choice}.")
+
+def timeline_path(directory, trace, mode, cpu=None, extension="pstl"):
+    name = os.path.splitext(os.path.basename(trace))[0]
+    lane = f".cpu{cpu}" if cpu is not None else ""
+    return os.path.join(directory, f"{name}.{mode.lower().replace(' ', '-')}{lane}.{extension}")
+
+def run_batch(trace, mode, with_jobs=False, with_timeline=False, cache=None, timeline_dir=None,
+              cpus=1, partitioned=False, migrate=True, aging=0.0, with_stats=False, snapshot_dir=None,
+              switch_cost=0.0, dispatch_cost=0.0, export_dir=None, export_format="columnar"):
+    # Schedules one trace file and returns a JSON-ready result. With cpus > 1
+    # the timeline is a list of per-CPU lanes.
+    started = time.perf_counter()
+    table = load_table(trace)
+    loaded = time.perf_counter()
+    charged = switch_cost > 0 or dispatch_cost > 0
+    # The overhead total is read off the timeline
+    want_timeline = with_timeline or timeline_dir or cpus > 1 or charged
+    stats = SimulationStats() if with_stats else None
+    if cpus > 1:
+        schedule = [Timeline() for _ in range(cpus)] if want_timeline else None
+        schedule_table_multi(table, cpus, schedule, preemptive=mode == "Preemptive",
+                             partitioned=partitioned, migrate=migrate)
+    else:
+        schedule = Timeline() if want_timeline else None
+        if export_dir:
+            # Streams per-job results and the timeline to files as they come
+            from schedcore.export import export_schedule
+            extension = "csv" if export_format == "csv" else "pscf"
+            result_files = {kind: timeline_path(export_dir, trace, mode, extension=f"{kind}.{extension}")
+                            for kind in ("jobs", "timeline")}
+            export_schedule(table, mode, result_files["jobs"], result_files["timeline"], export_format,
+                            aging=aging, stats=stats)
+        elif snapshot_dir:
+            # Resumes from the snapshot an interrupted run left behind
+            from schedcore.snapshot import schedule_table_resumable
+            schedule_table_resumable(table, mode, timeline_path(snapshot_dir, trace, mode, extension="pssn"),
+                                     schedule, aging=aging)
+        else:
+            policy = policy_for(mode).with_overhead(switch_cost, dispatch_cost) if charged else mode
+            if cache is not None:
+                cache.schedule_table(table, policy, schedule, aging=aging, stats=stats)
+            else:
+                schedule_table(table, policy, schedule, aging=aging, stats=stats)
+    finished = time.perf_counter()
+    report = compute_metrics(table, cpus=cpus, overhead=overhead_time(schedule) if charged else 0.0)
+    result = {
+        "trace": trace,
+        "mode": mode,
+        "cpus": cpus,
+        "aging": aging,
+        "switch_cost": switch_cost,
+        "dispatch_cost": dispatch_cost,
+        "load_seconds": loaded - started,
+        "schedule_seconds": finished - loaded,
+        "metrics": report.as_dict(),
+    }
+    if stats is not None:
+        result["stats"] = stats.as_dict()
+    if export_dir:
+        result["export_files"] = result_files
+    if cpus > 1:
+        result["per_cpu_utilization"] = lane_utilization(schedule, report.makespan)
+    if with_jobs:
+        result["jobs"] = [{"pid": p.pid, "arrival_time": p.arrival_time, "burst_time": p.burst_time,
+                           "priority": p.priority, "start_time": p.start_time,
+                           "completion_time": p.completion_time, "waiting_time": p.waiting_time,
+                           "turnaround_time": p.turnaround_time} for p in table]
+    if cpus > 1:
+        if with_timeline:
+            result["timeline"] = [lane.to_dicts() for lane in schedule]
+        if timeline_dir:
+            result["timeline_files"] = [timeline_path(timeline_dir, trace, mode, cpu) for cpu in range(cpus)]
+            for lane, path in zip(schedule, result["timeline_files"]):
+                lane.save(path)
+        return result
+    if with_timeline:
+        result["timeline"] = schedule.to_dicts()
+    if timeline_dir:
+        result["timeline_file"] = timeline_path(timeline_dir, trace, mode)
+        schedule.save(result["timeline_file"])
+    return result
+
+def csv_row(result):
+    metrics = result["metrics"]
+    row = {
+        "trace": result["trace"],
+        "mode": result["mode"],
+        "count": metrics["count"],
+        "avg_waiting": metrics["waiting"]["mean"],
+        "p50_waiting": metrics["waiting"]["p50"],
+        "p95_waiting": metrics["waiting"]["p95"],
+        "p99_waiting": metrics["waiting"]["p99"],
+        "avg_turnaround": metrics["turnaround"]["mean"],
+        "p95_turnaround": metrics["turnaround"]["p95"],
+        "avg_response": metrics["response"]["mean"],
+        "cpu_utilization": metrics["cpu_utilization"],
+        "overhead_time": metrics["overhead_time"],
+        "effective_utilization": metrics["effective_utilization"],
+        "throughput": metrics["throughput"],
+        "makespan": metrics["makespan"],
+        "load_seconds": result["load_seconds"],
+        "schedule_seconds": result["schedule_seconds"],
+    }
+    if "stats" in result:
+        row.update((name, result["stats"][name]) for name in STATS_FIELDS)
+    return row
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Priority Scheduling Simulator. Without --trace or --serve the interactive menu is started.")
+    parser.add_argument("--trace", action="append", default=[], help="CSV or JSONL trace file; may be repeated")
+    parser.add_argument("--mode", action="append", choices=sorted(MODE_ARGS) + ["all"],
+                        help="scheduling mode; may be repeated (default: all, or the priority modes with --cpus/--aging)")
+    parser.add_argument("--format", choices=("json", "csv"), default="json", help="output format (default: json)")
+    parser.add_argument("--output", help="write results to this file instead of stdout")
+    parser.add_argument("--jobs", action="store_true", help="include per-job results (json only)")
+    parser.add_argument("--timeline", action="store_true", help="include the Gantt timeline (json only)")
+    parser.add_argument("--timeline-dir", help="save each run's timeline here as a binary <trace>.<mode>.pstl file")
+    parser.add_argument("--cache-dir", help="reuse schedules of identical traces from this directory (single CPU only)")
+    parser.add_argument("--cpus", type=int, default=1, help="number of CPUs to simulate (default: 1)")
+    parser.add_argument("--partitioned", action="store_true", help="per-CPU run queues instead of one global queue")
+    parser.add_argument("--aging", type=float, default=0.0,
+                        help="priority boost per unit of waiting time (priority modes on a single CPU only, default: 0)")
+    parser.add_argument("--no-migrate", action="store_true", help="with --partitioned, never move jobs between CPUs")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="serve simulations over HTTP/JSON on localhost:PORT")
+    parser.add_argument("--workers", type=int, help="with --serve, simulation processes (default: one per CPU)")
+    parser.add_argument("--stats", action="store_true",
+                        help="report engine counters (queue ops, preemptions, context switches, idle time; single CPU only)")
+    parser.add_argument("--switch-cost", type=float, default=0.0,
+                        help="time charged when the CPU switches to a different job (single CPU only, default: 0)")
+    parser.add_argument("--dispatch-cost", type=float, default=0.0,
+                        help="time charged every time a job is dispatched (single CPU only, default: 0)")
+    parser.add_argument("--export-dir",
+                        help="stream per-job results and the timeline here as <trace>.<mode>.jobs/.timeline files")
+    parser.add_argument("--export-format", choices=("columnar", "csv"), default="columnar",
+                        help="format of --export-dir files (default: columnar)")
+    parser.add_argument("--snapshot-dir",
+                        help="snapshot long priority-mode runs here and resume interrupted ones (single CPU only)")
+    return parser.parse_args(argv)
+
+def batch_main(args):
+    if not args.mode or "all" in args.mode:
+        modes = list(PRIORITY_MODES if args.cpus > 1 or args.aging or args.snapshot_dir else MODES)
+    else:
+        modes = [MODE_ARGS[m] for m in args.mode]
+    if args.cpus < 1:
+        print("Error: --cpus must be at least 1", file=sys.stderr)
+        return 1
+    if args.cpus > 1 and any(mode not in PRIORITY_MODES for mode in modes):
+        print("Error: --cpus above 1 supports only the priority modes", file=sys.stderr)
+        return 1
+    if args.stats and args.cpus > 1:
+        print("Error: --stats needs a single CPU", file=sys.stderr)
+        return 1
+    if args.aging < 0 or (args.aging and args.cpus > 1):
+        print("Error: --aging must be non-negative and needs a single CPU", file=sys.stderr)
+        return 1
+    charged = args.switch_cost or args.dispatch_cost
+    if args.switch_cost < 0 or args.dispatch_cost < 0 or (charged and (args.cpus > 1 or args.aging)):
+        print("Error: --switch-cost/--dispatch-cost must be non-negative and need a single CPU without --aging",
+              file=sys.stderr)
+        return 1
+    if args.snapshot_dir and (charged or args.cpus > 1 or args.stats or args.cache_dir
+                              or any(mode not in PRIORITY_MODES for mode in modes)):
+        print("Error: --snapshot-dir needs a single CPU and the priority modes, without --stats, --cache-dir "
+              "or switch/dispatch costs",
+              file=sys.stderr)
+        return 1
+    if args.export_dir and (args.cpus > 1 or charged or args.cache_dir or args.snapshot_dir
+                            or args.timeline or args.timeline_dir):
+        print("Error: --export-dir needs a single CPU and cannot be combined with --cache-dir, --snapshot-dir, "
+              "--timeline, --timeline-dir or switch/dispatch costs", file=sys.stderr)
+        return 1
+    try:
+        cache = None
+        if args.cache_dir:
+            from schedcore.cache import ScheduleCache
+            cache = ScheduleCache(directory=args.cache_dir)
+        for directory in (args.timeline_dir, args.snapshot_dir, args.export_dir):
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        results = [run_batch(trace, mode, args.jobs, args.timeline, cache, args.timeline_dir,
+                             args.cpus, args.partitioned, not args.no_migrate, args.aging, args.stats,
+                             args.snapshot_dir, args.switch_cost, args.dispatch_cost, args.export_dir,
+                             args.export_format)
+                   for trace in args.trace for mode in modes]
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    out = open(args.output, "w", newline="", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(results, out, indent=2)
+            out.write("\n")
+        else:
+            writer = csv.DictWriter(out, fieldnames=CSV_FIELDS + (STATS_FIELDS if args.stats else ()))
+            writer.writeheader()
+            for result in results:
+                writer.writerow(csv_row(result))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if cache is not None:
+        stats = cache.stats()
+        print(f"Schedule cache: {stats['hits'] + stats['disk_hits']} hits, {stats['misses']} misses", file=sys.stderr)
+    return 0
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.trace:
+        sys.exit(batch_main(args))
+    if args.serve is not None:
+        import asyncio
+        from schedcore.service import serve
+        try:
+            asyncio.run(serve(port=args.serve, max_workers=args.workers))
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
     print(f"Priority Scheduling Simulator - Started at 10:38 AM PST, Wednesday, May 28, 2025")
-    main()
\ No newline at end of file
+    main(args.stats)
\ No newline at end of file
@@ -1,23 +1,34 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from operator import attrgetter
+import math
+import threading
 import uuid
-import heapq
 
-class Process:
-    def __init__(self, pid, arrival_time, burst_time, priority):
-        self.pid = pid
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.remaining_time = burst_time
-        self.priority = priority
-        self.waiting_time = 0
-        self.turnaround_time = 0
-        self.start_time = None
-        self.completion_time = None
+from schedcore import (MODES, IncrementalScheduler, Process, ScheduleCancelled, SimulationStats, TimelineIndex,
+                       compute_metrics, tick_step, ticks)
 
-    def __lt__(self, other):
-        # Priority Queue: smaller priority value = higher priority
-        return self.priority < other.priority if self.priority != other.priority else self.arrival_time < other.arrival_time
+# How often (ms) the Tk loop checks on a background scheduling run
+POLL_INTERVAL = 50
+
+# Results table: (column, heading, Process attribute). Only one page of rows
+# exists in the Treeview at a time.
+RESULT_COLUMNS = (
+    ("PID", "Process ID", "pid"),
+    ("Arrival Time", "Arrival Time", "arrival_time"),
+    ("Burst Time", "Burst Time", "burst_time"),
+    ("Priority", "Priority", "priority"),
+    ("Waiting Time", "Waiting Time", "waiting_time"),
+    ("Turnaround Time", "Turnaround Time", "turnaround_time"),
+)
+PAGE_SIZE = 200
+
+# Gantt plot geometry: the bars span x = GANTT_LEFT .. GANTT_LEFT + GANTT_WIDTH
+GANTT_CANVAS_WIDTH = 820
+GANTT_CANVAS_HEIGHT = 120
+GANTT_LEFT = 50
+GANTT_WIDTH = GANTT_CANVAS_WIDTH - 70
+GANTT_COLORS = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEEAD", "#D4A5A5"]  # Modern color palette
 
 class PrioritySchedulingApp:
     def __init__(self, root):
@@ -43,6 +54,34 @@ class PrioritySchedulingApp:
         self.processes = []
         self.schedule = []
         self.scheduling_mode = tk.StringVar(value="Non-Preemptive")
+        self.show_stats = tk.BooleanVar(value=False)
+        
+        # Gantt viewport: the chart only draws what falls inside
+        # [view_start, view_start + view_span)
+        self.timeline = None
+        self.pid_colors = {}
+        self.view_start = 0.0
+        self.view_span = 0.0
+        self._drag_origin = None
+        self._redraw_pending = False
+        
+        # One incremental scheduler per mode, so a run after adding processes
+        # only re-simulates from the earliest new arrival. last_mode tells
+        # whether another mode's results are currently on the Process objects.
+        self.schedulers = {mode: IncrementalScheduler(mode) for mode in MODES}
+        self.last_mode = None
+        
+        # Background scheduling run: worker thread, its shared state and the
+        # event used to cancel it
+        self.worker = None
+        self.job = None
+        self.cancel_event = None
+        
+        # Results table paging: rows holds the processes in display order
+        self.rows = []
+        self.page = 0
+        self.sort_column = None
+        self.sort_reverse = False
         
         # Create GUI elements
         self.create_widgets()
@@ -58,8 +97,8 @@ class PrioritySchedulingApp:
         mode_frame = ttk.Frame(input_frame)
         mode_frame.grid(row=0, column=0, columnspan=8, pady=5, sticky="w")
         ttk.Label(mode_frame, text="Scheduling Mode:").grid(row=0, column=0, padx=(0, 5), pady=5)
-        ttk.Radiobutton(mode_frame, text="Non-Preemptive", value="Non-Preemptive", variable=self.scheduling_mode).grid(row=0, column=1, padx=5, pady=5)
-        ttk.Radiobutton(mode_frame, text="Preemptive", value="Preemptive", variable=self.scheduling_mode).grid(row=0, column=2, padx=5, pady=5)
+        for column, mode in enumerate(MODES, start=1):
+            ttk.Radiobutton(mode_frame, text=mode, value=mode, variable=self.scheduling_mode).grid(row=0, column=column, padx=5, pady=5)
         
         # Input Fields
         fields = [
@@ -82,19 +121,20 @@ class PrioritySchedulingApp:
         button_frame = ttk.Frame(input_frame)
         button_frame.grid(row=2, column=0, columnspan=8, pady=10)
         ttk.Button(button_frame, text="Add Process", command=self.add_process).grid(row=0, column=0, padx=5, pady=5)
-        ttk.Button(button_frame, text="Calculate Schedule", command=self.calculate_schedule).grid(row=0, column=1, padx=5, pady=5)
+        self.calculate_button = ttk.Button(button_frame, text="Calculate Schedule", command=self.calculate_schedule)
+        self.calculate_button.grid(row=0, column=1, padx=5, pady=5)
         ttk.Button(button_frame, text="Clear All", command=self.clear_all).grid(row=0, column=2, padx=5, pady=5)
         ttk.Button(button_frame, text="About", command=self.show_about).grid(row=0, column=3, padx=5, pady=5)
+        self.cancel_button = ttk.Button(button_frame, text="Cancel", command=self.cancel_schedule, state="disabled")
+        self.cancel_button.grid(row=0, column=4, padx=5, pady=5)
+        self.progress = ttk.Progressbar(button_frame, orient="horizontal", length=120, mode="determinate", maximum=100)
+        self.progress.grid(row=0, column=5, padx=5, pady=5)
+        ttk.Checkbutton(button_frame, text="Engine Stats", variable=self.show_stats).grid(row=0, column=6, padx=5, pady=5)
         
         # Process Table
-        self.tree = ttk.Treeview(self.root, columns=("PID", "Arrival Time", "Burst Time", "Priority", "Waiting Time", "Turnaround Time"), show="headings")
-        self.tree.heading("PID", text="Process ID")
-        self.tree.heading("Arrival Time", text="Arrival Time")
-        self.tree.heading("Burst Time", text="Burst Time")
-        self.tree.heading("Priority", text="Priority")
-        self.tree.heading("Waiting Time", text="Waiting Time")
-        self.tree.heading("Turnaround Time", text="Turnaround Time")
-        for col in ("PID", "Arrival Time", "Burst Time", "Priority", "Waiting Time", "Turnaround Time"):
+        self.tree = ttk.Treeview(self.root, columns=[col for col, _, _ in RESULT_COLUMNS], show="headings")
+        for col, heading, _ in RESULT_COLUMNS:
+            self.tree.heading(col, text=heading, command=lambda col=col: self.sort_results(col))
             self.tree.column(col, width=100, anchor="center")
         self.tree.grid(row=1, column=0, padx=15, pady=10, sticky="nsew")
         
@@ -106,14 +146,32 @@ class PrioritySchedulingApp:
         # Gantt Chart Frame with border effect
         gantt_border = tk.Frame(self.root, bg="#d9dfe5", bd=2)
         gantt_border.grid(row=2, column=0, padx=15, pady=10, sticky="ew")
-        self.gantt_frame = ttk.LabelFrame(gantt_border, text="Gantt Chart", padding=(15, 10))
+        self.gantt_frame = ttk.LabelFrame(gantt_border, text="Gantt Chart (wheel to zoom, drag to pan)", padding=(15, 10))
         self.gantt_frame.grid(row=0, column=0, padx=2, pady=2, sticky="ew")
-        self.canvas = tk.Canvas(self.gantt_frame, height=120, bg="white", bd=0)
+        self.canvas = tk.Canvas(self.gantt_frame, width=GANTT_CANVAS_WIDTH, height=GANTT_CANVAS_HEIGHT, bg="white", bd=0)
         self.canvas.grid(row=0, column=0, sticky="ew")
+        self.gantt_scroll = ttk.Scrollbar(self.gantt_frame, orient="horizontal", command=self.scroll_gantt)
+        self.gantt_scroll.grid(row=1, column=0, sticky="ew")
+        self.canvas.bind("<MouseWheel>", lambda e: self.zoom_gantt(e.x, 0.8 if e.delta > 0 else 1.25))
+        self.canvas.bind("<Button-4>", lambda e: self.zoom_gantt(e.x, 0.8))
+        self.canvas.bind("<Button-5>", lambda e: self.zoom_gantt(e.x, 1.25))
+        self.canvas.bind("<ButtonPress-1>", self.start_gantt_drag)
+        self.canvas.bind("<B1-Motion>", self.drag_gantt)
+        self.canvas.bind("<Double-Button-1>", lambda e: self.reset_gantt_view())
+        
+        # Page controls for the results table
+        pager = ttk.Frame(self.root)
+        pager.grid(row=3, column=0, padx=15, pady=(5, 0))
+        self.prev_button = ttk.Button(pager, text="< Prev", command=lambda: self.change_page(-1), state="disabled")
+        self.prev_button.grid(row=0, column=0, padx=5)
+        self.page_label = ttk.Label(pager, text="No processes")
+        self.page_label.grid(row=0, column=1, padx=10)
+        self.next_button = ttk.Button(pager, text="Next >", command=lambda: self.change_page(1), state="disabled")
+        self.next_button.grid(row=0, column=2, padx=5)
         
         # Results Label
         self.result_label = ttk.Label(self.root, text="", font=("Helvetica", 11), background="#f0f2f5")
-        self.result_label.grid(row=3, column=0, padx=15, pady=(10, 15))
+        self.result_label.grid(row=4, column=0, padx=15, pady=(5, 15))
         
         # Configure grid weights
         self.root.grid_rowconfigure(1, weight=1)
@@ -223,6 +281,8 @@ class PrioritySchedulingApp:
             burst_time = float(burst_time_str)
             priority = int(priority_str)
             
+            if not (math.isfinite(arrival_time) and math.isfinite(burst_time)):
+                raise ValueError("Arrival and burst times must be finite")
             if arrival_time < 0:
                 raise ValueError("Arrival time must be non-negative")
             if burst_time <= 0:
@@ -230,9 +290,20 @@ class PrioritySchedulingApp:
             if priority < 0:
                 raise ValueError("Priority must be non-negative")
                 
-            # Add process to list and treeview
-            self.processes.append(Process(pid, arrival_time, burst_time, priority))
-            self.tree.insert("", "end", values=(pid, arrival_time, burst_time, priority, 0, 0))
+            # Add process to list and rows (in the active sort order) and, if
+            # it lands on or before the current page, refresh the treeview
+            process = Process(pid, arrival_time, burst_time, priority)
+            self.processes.append(process)
+            position = self.row_position(process)
+            self.rows.insert(position, process)
+            first = self.page * PAGE_SIZE
+            if position == len(self.rows) - 1 and position // PAGE_SIZE == self.page:
+                self.tree.insert("", "end", values=self.row_values(process))
+                self.update_pager()
+            elif position < first + PAGE_SIZE:
+                self.render_page()
+            else:
+                self.update_pager()
             
             # Clear entries
             self.pid_entry.delete(0, tk.END)
@@ -251,203 +322,281 @@ class PrioritySchedulingApp:
         if not self.processes:
             messagebox.showwarning("Warning", "No processes to schedule")
             return
+        if self.worker is not None:
+            return
             
         # Clear previous Gantt chart and schedule
         self.canvas.delete("all")
         self.schedule = []
-        
-        if self.scheduling_mode.get() == "Non-Preemptive":
-            self.calculate_non_preemptive()
-        else:
-            self.calculate_preemptive()
-            
-        # Update treeview
-        self.tree.delete(*self.tree.get_children())
-        for process in self.processes:
-            self.tree.insert("", "end", values=(
-                process.pid,
-                process.arrival_time,
-                process.burst_time,
-                process.priority,
-                process.waiting_time,
-                process.turnaround_time
-            ))
-        
-        # Draw Gantt chart
-        self.draw_gantt_chart()
-        
-    def calculate_non_preemptive(self):
-        current_time = 0
-        completed = []
-        total_waiting = 0
-        total_turnaround = 0
-        remaining_processes = self.processes.copy()
-        
-        while remaining_processes:
-            # Get available processes
-            available = [p for p in remaining_processes if p.arrival_time <= current_time]
-            
-            if not available:
-                next_arrival = min(p.arrival_time for p in remaining_processes)
-                self.schedule.append({"pid": "Idle", "start": current_time, "end": next_arrival})
-                current_time = next_arrival
-                continue
-            
-            # Select process with highest priority
-            current_process = min(available, key=lambda x: x.priority)
-            
-            # Calculate times
-            current_process.waiting_time = current_time - current_process.arrival_time
-            current_process.turnaround_time = current_process.waiting_time + current_process.burst_time
-            total_waiting += current_process.waiting_time
-            total_turnaround += current_process.turnaround_time
-            
-            # Add to schedule
-            self.schedule.append({
-                "pid": current_process.pid,
-                "start": current_time,
-                "end": current_time + current_process.burst_time
-            })
-            
-            # Update current time
-            current_time += current_process.burst_time
-            
-            # Move process to completed
-            completed.append(current_process)
-            remaining_processes.remove(current_process)
-        
-        # Restore processes
-        self.processes = completed
-        
-        # Display average times
-        avg_waiting = total_waiting / len(self.processes) if self.processes else 0
-        avg_turnaround = total_turnaround / len(self.processes) if self.processes else 0
-        self.result_label.config(text=f"Average Waiting Time: {avg_waiting:.2f} | Average Turnaround Time: {avg_turnaround:.2f}")
-        
-    def calculate_preemptive(self):
-        current_time = 0
-        completed = []
-        total_waiting = 0
-        total_turnaround = 0
-        ready_queue = []
-        current_process = None
-        remaining_processes = self.processes.copy()
-        
-        # Initialize process attributes
-        for process in remaining_processes:
-            process.remaining_time = process.burst_time
-            process.start_time = None
-            process.completion_time = None
-        
-        while len(completed) < len(self.processes):
-            # Add newly arrived processes to ready queue
-            for proc in remaining_processes[:]:  # Use slice to avoid modifying during iteration
-                if proc.arrival_time <= current_time:
-                    heapq.heappush(ready_queue, proc)
-                    remaining_processes.remove(proc)
-            
-            # Push current process back to queue if it exists and not completed
-            if current_process and current_process.remaining_time > 0:
-                heapq.heappush(ready_queue, current_process)
-            
-            if ready_queue:
-                next_process = heapq.heappop(ready_queue)
-                
-                # Record start time if first execution
-                if next_process.start_time is None:
-                    next_process.start_time = current_time
+        self.timeline = None
+        
+        # The worker only advances the mode's scheduler; results are copied
+        # onto the Process objects back on the Tk thread
+        snapshot = list(self.processes)
+        mode = self.scheduling_mode.get()
+        scheduler = self.schedulers[mode]
+        stats = SimulationStats() if self.show_stats.get() else None
+        job = {"mode": mode, "processes": snapshot, "done": 0, "total": len(snapshot),
+               "cancelled": False, "error": None, "stats": stats}
+        cancel_event = threading.Event()
+        
+        def progress(done, total):
+            job["done"] = done
+            if cancel_event.is_set():
+                raise ScheduleCancelled()
                 
-                # Add to schedule (for Gantt chart)
-                if not self.schedule or self.schedule[-1]["pid"] != next_process.pid or self.schedule[-1]["end"] < current_time:
-                    self.schedule.append({"pid": next_process.pid, "start": current_time, "end": current_time + 1})
-                else:
-                    self.schedule[-1]["end"] = current_time + 1
+        def work():
+            try:
+                scheduler.update(snapshot, progress, stats)
+            except ScheduleCancelled:
+                job["cancelled"] = True
+            except Exception as e:
+                job["error"] = e
                 
-                # Execute for one time unit
-                next_process.remaining_time -= 1
-                
-                if next_process.remaining_time == 0:
-                    next_process.completion_time = current_time + 1
-                    next_process.turnaround_time = next_process.completion_time - next_process.arrival_time
-                    next_process.waiting_time = next_process.turnaround_time - next_process.burst_time
-                    total_waiting += next_process.waiting_time
-                    total_turnaround += next_process.turnaround_time
-                    completed.append(next_process)
-                    current_process = None
-                else:
-                    current_process = next_process
-            else:
-                # CPU is idle
-                if not self.schedule or self.schedule[-1]["pid"] != "Idle":
-                    self.schedule.append({"pid": "Idle", "start": current_time, "end": current_time + 1})
-                else:
-                    self.schedule[-1]["end"] = current_time + 1
-                current_process = None
+        self.job = job
+        self.cancel_event = cancel_event
+        self.worker = threading.Thread(target=work, daemon=True)
+        self.calculate_button.config(state="disabled")
+        self.cancel_button.config(state="normal")
+        self.progress["value"] = 0
+        self.result_label.config(text="Scheduling...")
+        self.worker.start()
+        self.root.after(POLL_INTERVAL, self.poll_schedule)
+        
+    def cancel_schedule(self):
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.result_label.config(text="Cancelling...")
             
-            current_time += 1
-        
-        # Restore processes
-        self.processes = completed
+    def poll_schedule(self):
+        job = self.job
+        if job is None:
+            return
+        if self.worker.is_alive():
+            if job["total"]:
+                self.progress["value"] = 100 * job["done"] / job["total"]
+            self.root.after(POLL_INTERVAL, self.poll_schedule)
+            return
+            
+        self.worker = None
+        self.job = None
+        self.cancel_event = None
+        self.calculate_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        if job["cancelled"]:
+            self.progress["value"] = 0
+            self.result_label.config(text="Scheduling cancelled")
+            return
+        if job["error"] is not None:
+            self.progress["value"] = 0
+            self.result_label.config(text="")
+            messagebox.showerror("Error", f"Scheduling failed: {job['error']}")
+            return
+        self.progress["value"] = 100
+        self.show_schedule(job)
+        
+    def show_schedule(self, job):
+        # Processes added while the worker ran stay unscheduled at the end
+        mode = job["mode"]
+        scheduler = self.schedulers[mode]
+        scheduled = scheduler.apply(full=self.last_mode != mode)
+        self.last_mode = mode
+        seen = set(map(id, scheduled))
+        self.processes = scheduled + [p for p in self.processes if id(p) not in seen]
+        self.schedule = scheduler.schedule
+        summary = compute_metrics(scheduled).summary()
+        if job["stats"] is not None:
+            summary += "\n" + job["stats"].summary()
+        self.result_label.config(text=summary)
+            
+        # Update treeview
+        self.set_rows(self.processes)
         
-        # Display average times
-        avg_waiting = total_waiting / len(self.processes) if self.processes else 0
-        avg_turnaround = total_turnaround / len(self.processes) if self.processes else 0
-        self.result_label.config(text=f"Average Waiting Time: {avg_waiting:.2f} | Average Turnaround Time: {avg_turnaround:.2f}")
+        # Draw Gantt chart
+        self.set_gantt_schedule()
         
-    def draw_gantt_chart(self):
-        if not self.schedule:
+    def row_values(self, process):
+        return tuple(getattr(process, attr) for _, _, attr in RESULT_COLUMNS)
+
+    def set_rows(self, processes):
+        self.rows = list(processes)
+        if self.sort_column is not None:
+            self.rows.sort(key=attrgetter(self.sort_attr()), reverse=self.sort_reverse)
+        self.page = 0
+        self.render_page()
+
+    def row_position(self, process):
+        # Index in rows that a stable re-sort would give a new process:
+        # after every row with an equal key
+        if self.sort_column is None:
+            return len(self.rows)
+        key = attrgetter(self.sort_attr())
+        value = key(process)
+        low, high = 0, len(self.rows)
+        while low < high:
+            middle = (low + high) // 2
+            other = key(self.rows[middle])
+            if (other < value) if self.sort_reverse else (value < other):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def sort_attr(self):
+        return next(attr for col, _, attr in RESULT_COLUMNS if col == self.sort_column)
+
+    def sort_results(self, column):
+        # Sorts the row list once; only the visible page is re-inserted
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        for col, heading, _ in RESULT_COLUMNS:
+            arrow = (" \u25bc" if self.sort_reverse else " \u25b2") if col == column else ""
+            self.tree.heading(col, text=heading + arrow)
+        self.set_rows(self.rows)
+
+    def change_page(self, delta):
+        pages = max(1, -(-len(self.rows) // PAGE_SIZE))
+        page = min(max(self.page + delta, 0), pages - 1)
+        if page != self.page:
+            self.page = page
+            self.render_page()
+
+    def render_page(self):
+        self.tree.delete(*self.tree.get_children())
+        first = self.page * PAGE_SIZE
+        for process in self.rows[first:first + PAGE_SIZE]:
+            self.tree.insert("", "end", values=self.row_values(process))
+        self.tree.yview_moveto(0)
+        self.update_pager()
+
+    def update_pager(self):
+        total = len(self.rows)
+        first = self.page * PAGE_SIZE
+        if total:
+            self.page_label.config(text=f"Rows {first + 1}-{min(first + PAGE_SIZE, total)} of {total}")
+        else:
+            self.page_label.config(text="No processes")
+        self.prev_button.config(state="normal" if self.page > 0 else "disabled")
+        self.next_button.config(state="normal" if first + PAGE_SIZE < total else "disabled")
+
+    def set_gantt_schedule(self):
+        # Index the finished schedule once; redraws then only touch the
+        # segments inside the current view
+        self.timeline = TimelineIndex(self.schedule) if self.schedule else None
+        self.pid_colors = {}
+        for segment in self.schedule:
+            pid = segment["pid"]
+            if pid != "Idle" and pid not in self.pid_colors:
+                self.pid_colors[pid] = GANTT_COLORS[len(self.pid_colors) % len(GANTT_COLORS)]
+        self.reset_gantt_view()
+
+    def gantt_total_time(self):
+        return self.timeline.end if self.timeline is not None else 0.0
+
+    def reset_gantt_view(self):
+        self.view_start = 0.0
+        self.view_span = self.gantt_total_time()
+        self.request_gantt_redraw()
+
+    def set_gantt_view(self, start, span):
+        total_time = self.gantt_total_time()
+        if total_time <= 0:
             return
-            
-        # Canvas dimensions
-        canvas_width = 820
-        canvas_height = 120
-        self.canvas.config(width=canvas_width)
-        
-        # Calculate total time for scaling
-        total_time = max(segment["end"] for segment in self.schedule)
-        if total_time == 0:
+        self.view_span = min(max(span, total_time * 1e-6), total_time)
+        self.view_start = min(max(start, 0.0), total_time - self.view_span)
+        self.request_gantt_redraw()
+
+    def zoom_gantt(self, x, factor):
+        if self.view_span <= 0:
+            return
+        # Keep the time under the mouse pointer fixed while zooming
+        fraction = min(max((x - GANTT_LEFT) / GANTT_WIDTH, 0.0), 1.0)
+        anchor = self.view_start + fraction * self.view_span
+        span = self.view_span * factor
+        self.set_gantt_view(anchor - fraction * span, span)
+
+    def start_gantt_drag(self, event):
+        self._drag_origin = (event.x, self.view_start)
+
+    def drag_gantt(self, event):
+        if self._drag_origin is None or self.view_span <= 0:
+            return
+        x, start = self._drag_origin
+        self.set_gantt_view(start - (event.x - x) * self.view_span / GANTT_WIDTH, self.view_span)
+
+    def scroll_gantt(self, action, amount, unit=None):
+        total_time = self.gantt_total_time()
+        if action == "moveto":
+            self.set_gantt_view(float(amount) * total_time, self.view_span)
+        elif action == "scroll":
+            step = self.view_span if unit == "pages" else self.view_span / 10
+            self.set_gantt_view(self.view_start + int(amount) * step, self.view_span)
+
+    def request_gantt_redraw(self):
+        # Coalesce bursts of zoom/pan events into one redraw per idle cycle
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after_idle(self.draw_gantt_chart)
+
+    def draw_gantt_chart(self):
+        self._redraw_pending = False
+        self.canvas.delete("all")
+        total_time = self.gantt_total_time()
+        if total_time == 0 or self.view_span <= 0:
+            self.gantt_scroll.set(0.0, 1.0)
             return
             
-        scale = (canvas_width - 70) / total_time  # 70 pixels for labels
+        t0 = self.view_start
+        t1 = t0 + self.view_span
+        scale = GANTT_WIDTH / self.view_span
         y_start = 40
         bar_height = 40
-        colors = ["#FF6B6B", "#4ECDC4", "#45B7D1", "#96CEB4", "#FFEEAD", "#D4A5A5"]  # Modern color palette
         
         # Draw background grid
-        self.canvas.create_rectangle(50, 20, canvas_width - 20, canvas_height - 20, fill="white", outline="#d9dfe5")
+        self.canvas.create_rectangle(GANTT_LEFT, 20, GANTT_CANVAS_WIDTH - 20, GANTT_CANVAS_HEIGHT - 20, fill="white", outline="#d9dfe5")
         
-        # Draw time labels and grid lines
-        for t in range(0, int(total_time) + 1):
-            x = 50 + t * scale
+        # Draw time labels and grid lines, spaced so labels never overlap
+        for t in ticks(t0, t1, tick_step(self.view_span, GANTT_WIDTH)):
+            x = GANTT_LEFT + (t - t0) * scale
             self.canvas.create_line(x, y_start - 10, x, y_start + bar_height + 10, fill="#d9dfe5", dash=(2, 2))
-            self.canvas.create_text(x, y_start - 15, text=str(t), font=("Helvetica", 9), fill="#333333")
+            self.canvas.create_text(x, y_start - 15, text=f"{t:g}", font=("Helvetica", 9), fill="#333333")
         
-        # Draw process bars
-        pid_to_color = {}
-        color_index = 0
-        for segment in self.schedule:
-            pid = segment["pid"]
-            if pid != "Idle" and pid not in pid_to_color:
-                pid_to_color[pid] = colors[color_index % len(colors)]
-                color_index += 1
-            color = pid_to_color.get(pid, "#e0e0e0")  # Use gray for Idle
-            x_start = 50 + segment["start"] * scale
-            x_end = 50 + segment["end"] * scale
-            self.canvas.create_rectangle(x_start, y_start, x_end, y_start + bar_height, fill=color, outline="#333333")
+        # Draw process bars; segments narrower than a pixel come back merged
+        # into one bar with pid None
+        for start, end, pid in self.timeline.bars(t0, t1, 1 / scale):
+            if pid is None:
+                color = "#9e9e9e"
+            else:
+                color = self.pid_colors.get(pid, "#e0e0e0")  # Use gray for Idle
+            x_start = GANTT_LEFT + (max(start, t0) - t0) * scale
+            x_end = GANTT_LEFT + (min(end, t1) - t0) * scale
+            outline = "#333333" if x_end - x_start > 3 else ""
+            self.canvas.create_rectangle(x_start, y_start, x_end, y_start + bar_height, fill=color, outline=outline)
             # Only show text if segment is wide enough
-            if x_end - x_start > 20:
+            if pid is not None and x_end - x_start > 20:
                 text_x = (x_start + x_end) / 2
                 text_y = y_start + bar_height / 2
                 self.canvas.create_text(text_x, text_y, text=pid, font=("Helvetica", 10, "bold"), fill="#333333")
         
         # Draw Y-axis label
         self.canvas.create_text(30, y_start + bar_height / 2, text="Processes", angle=90, font=("Helvetica", 10, "bold"), fill="#333333")
+        self.gantt_scroll.set(t0 / total_time, t1 / total_time)
         
     def clear_all(self):
+        if self.cancel_event is not None:
+            # Drop the running job; poll_schedule still resets the buttons
+            self.cancel_event.set()
+            self.job["cancelled"] = True
+        self.progress["value"] = 0
         self.processes = []
         self.schedule = []
-        self.tree.delete(*self.tree.get_children())
+        self.timeline = None
+        self.set_rows([])
         self.canvas.delete("all")
+        self.gantt_scroll.set(0.0, 1.0)
         self.result_label.config(text="")
         self.pid_entry.delete(0, tk.END)
         self.pid_entry.insert(0, "Optional")
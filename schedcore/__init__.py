@@ -0,0 +1,81 @@
+# Headless scheduling core shared by the CLI and the Tk app. Nothing in this
+# package imports tkinter.
+from types import ModuleType as _ModuleType
+
+from .process import Process
+from .timeline import Timeline, TimelineIndex, add_segment, segment_writer, tick_step, ticks
+from .policies import (
+    POLICIES,
+    MultilevelFeedbackQueue,
+    Policy,
+    PriorityPolicy,
+    RoundRobin,
+    ShortestJobFirst,
+    ShortestRemainingTimeFirst,
+    policy_for,
+)
+from .engines import (
+    MODES,
+    SIMULATORS,
+    PolicySimulator,
+    ScheduleCancelled,
+    calculate_non_preemptive,
+    calculate_preemptive,
+    run_schedule,
+    simulate_non_preemptive,
+    simulate_policy,
+    simulate_preemptive,
+    simulator_for,
+)
+from .table import Labels, ProcessTable, ProcessView, apply_results, run_table, schedule_table
+from .metrics import MetricsReport, average_times, compute_metrics, overhead_time, percentile
+from .workload import iter_jobs, load_table, parse_job, read_trace
+from .generate import SyntheticWorkload, generate_table
+from .incremental import IncrementalScheduler
+from .stats import SimulationStats
+from .multicpu import lane_utilization, schedule_table_multi, simulate_multiprocessor
+from .online import Decision, OnlineScheduler
+
+__all__ = [name for name, value in globals().items() if not name.startswith("_") and not isinstance(value, _ModuleType)]
+
+# Modules with costly imports (asyncio, concurrent.futures, hashlib, json,
+# tempfile) load on first use, so importing schedcore stays cheap
+_LAZY = {
+    "ScheduleCache": "cache",
+    "cache_key": "cache",
+    "fingerprint": "cache",
+    "ColumnarWriter": "export",
+    "CsvWriter": "export",
+    "TimelineExport": "export",
+    "export_schedule": "export",
+    "iter_export": "export",
+    "open_writer": "export",
+    "read_export": "export",
+    "read_job_results": "export",
+    "read_timeline_export": "export",
+    "SnapshotLog": "snapshot",
+    "schedule_table_resumable": "snapshot",
+    "snapshot_info": "snapshot",
+    "ScheduleService": "service",
+    "serve": "service",
+    "run_sweep": "sweep",
+    "run_task": "sweep",
+    "summarize": "sweep",
+    "sweep_tasks": "sweep",
+}
+
+# The lazy names are listed too, so "from schedcore import *" still binds
+# them (loading their modules)
+__all__ += sorted(_LAZY)
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,112 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from .engines import SIMULATORS
+from .generate import generate_table
+from .table import schedule_table
+
+# Engine benchmarks: python -m schedcore.bench --sizes 10 1000 100000
+#
+# Each case schedules a seeded synthetic workload whose mean burst is the
+# burst scale, with arrivals at 90% load, so larger scales only stretch the
+# time axis. Wall time comes from an untraced run; peak memory from a second
+# run under tracemalloc, which would otherwise skew the timing.
+
+DEFAULT_SIZES = (10, 1000, 100000)
+DEFAULT_SCALES = (1, 1000, 1000000)
+LOAD = 0.9
+
+def bench_case(mode, size, scale, seed=0, repeat=3, memory=True):
+    table = generate_table(size, seed, arrival_rate=LOAD / scale, burst_mean=scale)
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        schedule_table(table, mode)
+        best = min(best, time.perf_counter() - started)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        schedule_table(table, mode)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {
+        "mode": mode,
+        "size": size,
+        "burst_scale": scale,
+        "seconds": best,
+        "jobs_per_second": size / best if best > 0 else None,
+        "peak_bytes": peak,
+    }
+
+def run_benchmarks(modes=None, sizes=DEFAULT_SIZES, scales=DEFAULT_SCALES, seed=0, repeat=3,
+                   memory=True, progress=None):
+    modes = list(SIMULATORS) if modes is None else list(modes)
+    results = []
+    for mode in modes:
+        for size in sizes:
+            for scale in scales:
+                result = bench_case(mode, size, scale, seed, repeat, memory)
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+
+def compare(report, baseline, tolerance=0.25):
+    # Cases more than `tolerance` slower than in the baseline report
+    before = {(r["mode"], r["size"], r["burst_scale"]): r for r in baseline["results"]}
+    regressions = []
+    for r in report["results"]:
+        old = before.get((r["mode"], r["size"], r["burst_scale"]))
+        if old and old["seconds"] > 0 and r["seconds"] > old["seconds"] * (1 + tolerance):
+            regressions.append({**r, "baseline_seconds": old["seconds"],
+                                "slowdown": r["seconds"] / old["seconds"]})
+    return regressions
+
+def _print_result(r):
+    peak = f"{r['peak_bytes'] / 1e6:9.2f} MB" if r["peak_bytes"] is not None else "        -"
+    rate = f"{r['jobs_per_second']:12.0f}" if r["jobs_per_second"] else "           -"
+    print(f"{r['mode']:<16}{r['size']:>10}{r['burst_scale']:>10g}{r['seconds']:>12.4f}s{rate} jobs/s{peak}",
+          file=sys.stderr)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling engines.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--scales", type=float, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--mode", action="append", choices=sorted(SIMULATORS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs. baseline (default 0.25)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.mode, args.sizes, args.scales, args.seed, args.repeat,
+                            not args.no_memory, _print_result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['mode']} size={r['size']} scale={r['burst_scale']:g}: "
+                  f"{r['seconds']:.4f}s vs {r['baseline_seconds']:.4f}s ({r['slowdown']:.2f}x)", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
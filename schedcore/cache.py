@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from array import array
+from collections import OrderedDict
+
+from .table import ProcessTable, schedule_table
+from .timeline import segment_writer
+
+# Memoized schedules. A run is keyed on a content hash of the workload (the
+# arrival, burst, priority and PID columns) plus the mode and any policy
+# options, so identical workloads hit the cache however they were built.
+# Entries hold the result columns as raw bytes and the Gantt timeline; the
+# memory tier is an LRU, and an optional directory tier is shared between
+# processes (e.g. sweep workers) and survives restarts.
+#
+# Disk entries are plain data, never pickles: a header, the key, the timeline
+# PIDs as a JSON list of distinct values, the result columns and then the
+# timeline's start, end and PID-index columns. Anything that does not decode
+# to exactly that layout for the requested key is a miss.
+
+RESULT_COLUMNS = ("start_time", "completion_time", "waiting_time", "turnaround_time")
+ENTRY_MAGIC = b"PSCE"
+ENTRY_VERSION = 1
+_ENTRY_HEADER = struct.Struct("<4sHxxIIQQ")   # magic, version, key size, labels size, rows, segments
+
+def _encode_entry(key, entry):
+    columns, segments = entry
+    labels, index = [], {}
+    pids, starts, ends = array("I"), array("d"), array("d")
+    for pid, start, end in segments:
+        i = index.get(pid)
+        if i is None:
+            i = index[pid] = len(labels)
+            labels.append(pid)
+        pids.append(i)
+        starts.append(start)
+        ends.append(end)
+    encoded_key = key.encode("utf-8")
+    encoded_labels = json.dumps(labels).encode("utf-8")
+    rows = len(columns[RESULT_COLUMNS[0]]) // 8
+    parts = [_ENTRY_HEADER.pack(ENTRY_MAGIC, ENTRY_VERSION, len(encoded_key), len(encoded_labels), rows,
+                                len(segments)), encoded_key, encoded_labels]
+    parts += [columns[name] for name in RESULT_COLUMNS]
+    parts += [starts.tobytes(), ends.tobytes(), pids.tobytes()]
+    return b"".join(parts)
+
+def _decode_entry(data, key):
+    # Raises ValueError unless data is a complete entry for key
+    if len(data) < _ENTRY_HEADER.size:
+        raise ValueError("Cache entry is truncated")
+    magic, version, key_size, labels_size, rows, count = _ENTRY_HEADER.unpack_from(data)
+    if magic != ENTRY_MAGIC or version != ENTRY_VERSION:
+        raise ValueError("Not a cache entry")
+    if len(data) != _ENTRY_HEADER.size + key_size + labels_size + 8 * len(RESULT_COLUMNS) * rows + 20 * count:
+        raise ValueError("Cache entry has the wrong size")
+    offset = _ENTRY_HEADER.size
+    if data[offset:offset + key_size].decode("utf-8") != key:
+        raise ValueError("Cache entry is for another key")
+    offset += key_size
+    labels = json.loads(data[offset:offset + labels_size].decode("utf-8"))
+    if not isinstance(labels, list):
+        raise ValueError("Cache entry labels must be a list")
+    offset += labels_size
+    columns = {}
+    for name in RESULT_COLUMNS:
+        columns[name] = data[offset:offset + 8 * rows]
+        offset += 8 * rows
+    starts, ends, pids = array("d"), array("d"), array("I")
+    for column in (starts, ends, pids):
+        column.frombytes(data[offset:offset + column.itemsize * count])
+        offset += column.itemsize * count
+    if count and max(pids) >= len(labels):
+        raise ValueError("Cache entry PID index out of range")
+    return columns, [(labels[i], start, end) for i, start, end in zip(pids, starts, ends)]
+
+def fingerprint(source):
+    # source is a ProcessTable or a list of Process objects
+    table = source if isinstance(source, ProcessTable) else ProcessTable.from_processes(source)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(len(table).to_bytes(8, "little"))
+    for column in (table.arrival_time, table.burst_time, table.priority, table.pid):
+        h.update(column.tobytes())
+    if table.labels is not None:
+        h.update(table.labels.ends.tobytes())
+        h.update(table.labels.data)
+    return h.hexdigest()
+
+def cache_key(source, mode, **options):
+    opts = ",".join(f"{k}={options[k]!r}" for k in sorted(options))
+    return f"{fingerprint(source)}:{mode}:{opts}"
+
+class ScheduleCache:
+    def __init__(self, max_entries=128, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries or (self.directory is not None and os.path.exists(self._path(key)))
+
+    def stats(self):
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        self.entries.clear()
+
+    def _path(self, key):
+        name = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.directory, name + ".entry")
+
+    def get(self, key):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+        if self.directory is not None:
+            try:
+                with open(self._path(key), "rb") as f:
+                    value = _decode_entry(f.read(), key)
+            except Exception:
+                # Unreadable, foreign or malformed: a miss either way
+                value = None
+            if value is not None:
+                self.disk_hits += 1
+                self._remember(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        if self.directory is not None:
+            # Write to a temporary file first so concurrent readers never see
+            # a partial entry
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(_encode_entry(key, value))
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+                raise
+
+    def _remember(self, key, value):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def schedule_table(self, table, mode, schedule=None, progress=None, aging=0.0, stats=None):
+        # Same contract as schedcore.schedule_table, answered from the cache
+        # when this workload and mode have been scheduled before (stats are
+        # then left untouched, as no engine runs)
+        key = cache_key(table, mode, aging=aging) if aging else cache_key(table, mode)
+        entry = self.get(key)
+        if entry is None:
+            timeline = []
+            schedule_table(table, mode, timeline, progress, aging, stats)
+            entry = ({name: getattr(table, name).tobytes() for name in RESULT_COLUMNS},
+                     [(s["pid"], s["start"], s["end"]) for s in timeline])
+            self.put(key, entry)
+        else:
+            columns, _ = entry
+            for name in RESULT_COLUMNS:
+                column = array("d")
+                column.frombytes(columns[name])
+                setattr(table, name, column)
+        if schedule is not None:
+            emit = segment_writer(schedule)
+            for pid, start, end in entry[1]:
+                emit(pid, start, end)
+        return table
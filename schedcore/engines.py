@@ -0,0 +1,332 @@
+import heapq
+
+from .policies import POLICIES, Policy
+from .timeline import segment_writer
+
+# The engines consume jobs as (pid, arrival, burst, priority, ...) sequences in
+# non-decreasing arrival order and yield (job, start, completion) as each job
+# finishes. Extra trailing fields on a job are carried through untouched, which
+# is how the wrappers below map results back onto Process objects or table rows.
+
+# Aging: with aging=r a job's effective priority is priority - r * (time spent
+# waiting so far). Every waiting job ages at the same rate, so ordering ready
+# jobs by effective priority at time t is the same as ordering them by the
+# fixed key priority + r * (arrival + service received). The ready heap is
+# keyed on that and never needs re-heapifying; only the running job's key
+# moves, by r per unit of CPU time it gets. aging=0 is plain priority order.
+#
+# In the preemptive engine a waiting job takes over once the running job's
+# key exceeds its own by the hysteresis margin r * aging_slice / 2, at an
+# arrival or at the crossover computed between events. After a swap the job
+# that took over is one margin ahead, so two jobs that age level with each
+# other take turns of aging_slice time units rather than swapping on every
+# event or not at all. With aging=0 the margin is 0 and a waiting job needs a
+# strictly better key, which is the same as comparing whole entries since the
+# running job never ties an older waiting one.
+
+AGING_SLICE = 1.0
+
+# Checkpointing (priority engines only): with checkpoint given, the engine
+# calls checkpoint.save(clock, seq, ready_queue, current) at the top of every
+# checkpoint.interval-th loop iteration, where seq is also the number of jobs
+# taken from the input so far. save() must copy what it needs before
+# returning. If checkpoint.restore() returns such a tuple the engine starts
+# from it instead, and jobs must then begin at job number seq.
+
+class ScheduleCancelled(Exception):
+    # Raised from a progress callback to abandon a run
+    pass
+
+def _instrument(schedule, stats):
+    # Segment writer and heap operations for one run; the stats versions
+    # only when stats is given
+    emit = segment_writer(schedule)
+    if stats is None:
+        return emit, heapq.heappush, heapq.heappop
+    stats.start()
+    return (stats.writer(emit),) + stats.heap_ops()
+
+def _next_job(jobs, last_arrival):
+    job = next(jobs, None)
+    if job is not None and job[1] < last_arrival:
+        raise ValueError("Jobs must be ordered by arrival time")
+    return job
+
+def simulate_non_preemptive(jobs, schedule=None, aging=0.0, stats=None, checkpoint=None):
+    emit, push, pop = _instrument(schedule, stats)
+    jobs = iter(jobs)
+    pending = _next_job(jobs, 0.0)
+    ready_queue = []
+    seq = 0
+    current_time = 0.0
+    if checkpoint is not None:
+        countdown = interval = checkpoint.interval
+        state = checkpoint.restore()
+        if state is not None:
+            current_time, seq, ready_queue, _ = state
+
+    while pending is not None or ready_queue:
+        if stats is not None:
+            stats.iterations += 1
+        if checkpoint is not None:
+            countdown -= 1
+            if not countdown:
+                countdown = interval
+                checkpoint.save(current_time, seq, ready_queue, None)
+        if not ready_queue and pending[1] > current_time:
+            emit("Idle", current_time, pending[1])
+            current_time = pending[1]
+        while pending is not None and pending[1] <= current_time:
+            # Same ordering as Process.__lt__, submission order breaks ties
+            push(ready_queue, (pending[3] + aging * pending[1], pending[1], seq, pending))
+            seq += 1
+            pending = _next_job(jobs, pending[1])
+
+        job = pop(ready_queue)[3]
+        start = current_time
+        current_time += job[2]
+        emit(job[0], start, current_time)
+        yield job, start, current_time
+    if stats is not None:
+        stats.finish()
+
+def simulate_preemptive(jobs, schedule=None, aging=0.0, stats=None, checkpoint=None, aging_slice=AGING_SLICE):
+    # Event-driven: the clock jumps straight to the next arrival, the running
+    # job's completion or an aging crossover, whichever comes first.
+    if aging and not aging_slice > 0:
+        raise ValueError("Aging slice must be positive")
+    margin = aging * aging_slice / 2
+    emit, push, pop = _instrument(schedule, stats)
+    jobs = iter(jobs)
+    pending = _next_job(jobs, 0.0)
+    ready_queue = []
+    seq = 0
+    current = None
+    current_time = 0.0
+    inf = float("inf")
+    if checkpoint is not None:
+        countdown = interval = checkpoint.interval
+        state = checkpoint.restore()
+        if state is not None:
+            current_time, seq, ready_queue, current = state
+
+    while pending is not None or ready_queue or current is not None:
+        if stats is not None:
+            stats.iterations += 1
+        if checkpoint is not None:
+            countdown -= 1
+            if not countdown:
+                countdown = interval
+                checkpoint.save(current_time, seq, ready_queue, current)
+        while pending is not None and pending[1] <= current_time:
+            # Entries are (aged key, arrival, seq, job, remaining, first start)
+            push(ready_queue, (pending[3] + aging * pending[1], pending[1], seq, pending, pending[2], None))
+            seq += 1
+            pending = _next_job(jobs, pending[1])
+
+        if ready_queue and (current is None or ready_queue[0][0] + margin < current[0]):
+            if current is not None:
+                push(ready_queue, current)
+                if stats is not None:
+                    stats.preemptions += 1
+            current = pop(ready_queue)
+
+        next_arrival = pending[1] if pending is not None else inf
+        if current is None:
+            emit("Idle", current_time, next_arrival)
+            current_time = next_arrival
+            continue
+
+        key, arrival, order, job, remaining, start = current
+        if start is None:
+            start = current_time
+        finish = current_time + remaining
+        crossover = inf
+        if aging and ready_queue:
+            crossover = current_time + (ready_queue[0][0] + margin - key) / aging
+        if crossover < finish and crossover <= next_arrival:
+            # Aged one margin past the best waiting job, which takes over
+            emit(job[0], current_time, crossover)
+            waiting = pop(ready_queue)
+            push(ready_queue, (waiting[0] + margin, arrival, order, job, finish - crossover, start))
+            current = waiting
+            current_time = crossover
+            if stats is not None:
+                stats.preemptions += 1
+        elif finish <= next_arrival:
+            emit(job[0], current_time, finish)
+            current = None
+            current_time = finish
+            yield job, start, finish
+        else:
+            # Run until the next arrival, which may preempt
+            emit(job[0], current_time, next_arrival)
+            current = (key + aging * (next_arrival - current_time), arrival, order, job, finish - next_arrival, start)
+            current_time = next_arrival
+    if stats is not None:
+        stats.finish()
+
+def simulate_policy(jobs, policy, schedule=None, stats=None):
+    # Shared event loop for any Policy (see policies.py). Besides arrivals and
+    # completions it stops when the running job's quantum runs out.
+    #
+    # Overhead: a dispatch is charged as an "Overhead" segment before the job
+    # runs, and the loop then restarts at its end, so jobs that arrived
+    # during it are queued (and may preempt) before the job's quantum starts.
+    # A job's start time is when it first runs after its switch.
+    emit, push, pop = _instrument(schedule, stats)
+    key_of, quantum_of, demote = policy.key, policy.quantum, policy.demote
+    preemptive, at_tail = policy.preemptive, policy.requeue_at_tail
+    charged = policy.has_overhead
+    dispatch_cost, switch_cost = policy.dispatch_cost, policy.switch_cost
+    last_job = None
+    starting = False
+    jobs = iter(jobs)
+    pending = _next_job(jobs, 0.0)
+    ready_queue = []   # (key, seq, job, remaining, first start, level)
+    seq = 0
+    current = None
+    slice_end = None
+    current_time = 0.0
+    inf = float("inf")
+
+    while pending is not None or ready_queue or current is not None:
+        if stats is not None:
+            stats.iterations += 1
+        while pending is not None and pending[1] <= current_time:
+            push(ready_queue, (key_of(pending, pending[2], 0), seq, pending, pending[2], None, 0))
+            seq += 1
+            pending = _next_job(jobs, pending[1])
+
+        if slice_end is not None and current_time >= slice_end:
+            # Quantum used up: requeue (possibly a level down) behind anything
+            # that arrived meanwhile, then pick again
+            key, order, job, remaining, start, level = current
+            level = demote(level)
+            if at_tail:
+                order = seq
+                seq += 1
+            push(ready_queue, (key_of(job, remaining, level), order, job, remaining, start, level))
+            current = slice_end = None
+        elif current is not None and preemptive and ready_queue:
+            key, order, job, remaining, start, level = current
+            key = key_of(job, remaining, level)
+            if ready_queue[0][:2] < (key, order):
+                if at_tail:
+                    order = seq
+                    seq += 1
+                push(ready_queue, (key, order, job, remaining, start, level))
+                current = None
+                if stats is not None:
+                    stats.preemptions += 1
+        if current is None and ready_queue:
+            current = pop(ready_queue)
+            starting = True
+            if charged:
+                job = current[2]
+                cost = dispatch_cost if last_job is None or job is last_job else dispatch_cost + switch_cost
+                last_job = job
+                if cost:
+                    emit("Overhead", current_time, current_time + cost)
+                    current_time += cost
+                    slice_end = None
+                    continue
+        if starting and current is not None:
+            starting = False
+            key, order, job, remaining, start, level = current
+            if start is None:
+                current = (key, order, job, remaining, current_time, level)
+            quantum = quantum_of(level)
+            slice_end = current_time + quantum if quantum is not None and quantum < remaining else None
+
+        next_arrival = pending[1] if pending is not None else inf
+        if current is None:
+            emit("Idle", current_time, next_arrival)
+            current_time = next_arrival
+            continue
+
+        key, order, job, remaining, start, level = current
+        finish = current_time + remaining
+        stop = finish if slice_end is None else slice_end
+        if preemptive and stop > next_arrival:
+            # Run until the next arrival, which may preempt
+            emit(job[0], current_time, next_arrival)
+            current = (key, order, job, finish - next_arrival, start, level)
+            current_time = next_arrival
+        elif slice_end is None:
+            emit(job[0], current_time, finish)
+            current = None
+            current_time = finish
+            yield job, start, finish
+        else:
+            emit(job[0], current_time, slice_end)
+            current = (key, order, job, finish - slice_end, start, level)
+            current_time = slice_end
+    if stats is not None:
+        stats.finish()
+
+class PolicySimulator:
+    # Engine-compatible callable, so a policy can be registered in SIMULATORS
+    def __init__(self, policy):
+        self.policy = policy
+
+    def __call__(self, jobs, schedule=None, aging=0.0, stats=None):
+        if aging:
+            raise ValueError(f"Aging is not supported by the {self.policy.name} policy")
+        return simulate_policy(jobs, self.policy, schedule, stats)
+
+# The two priority modes keep their dedicated engines; every other policy
+# runs on simulate_policy with its default settings
+SIMULATORS = {
+    "Non-Preemptive": simulate_non_preemptive,
+    "Preemptive": simulate_preemptive,
+}
+SIMULATORS.update((name, PolicySimulator(policy())) for name, policy in POLICIES.items())
+
+def simulator_for(mode):
+    # mode is a SIMULATORS name or a Policy instance (e.g. RoundRobin(4.0))
+    if isinstance(mode, Policy):
+        return PolicySimulator(mode)
+    if mode not in SIMULATORS:
+        raise ValueError(f"Unknown scheduling mode: {mode}")
+    return SIMULATORS[mode]
+
+def _run_processes(simulator, processes, schedule, aging=0.0, stats=None):
+    pending = sorted(processes, key=lambda p: p.arrival_time)
+    jobs = [(p.pid, p.arrival_time, p.burst_time, p.priority, p) for p in pending]
+    completed = []
+    for job, start, completion in simulator(jobs, schedule, aging, stats):
+        proc = job[4]
+        proc.remaining_time = 0
+        proc.start_time = start
+        proc.completion_time = completion
+        proc.turnaround_time = completion - proc.arrival_time
+        proc.waiting_time = proc.turnaround_time - proc.burst_time
+        completed.append(proc)
+    processes[:] = completed
+
+def calculate_non_preemptive(processes, schedule=None, aging=0.0, stats=None):
+    _run_processes(simulate_non_preemptive, processes, schedule, aging, stats)
+
+def calculate_preemptive(processes, schedule=None, aging=0.0, stats=None):
+    _run_processes(simulate_preemptive, processes, schedule, aging, stats)
+
+def _calculator(simulator):
+    def calculate(processes, schedule=None, aging=0.0, stats=None):
+        _run_processes(simulator, processes, schedule, aging, stats)
+    return calculate
+
+MODES = {
+    "Non-Preemptive": calculate_non_preemptive,
+    "Preemptive": calculate_preemptive,
+}
+MODES.update((name, _calculator(SIMULATORS[name])) for name in POLICIES)
+
+def run_schedule(processes, mode, schedule=None, aging=0.0, stats=None):
+    if isinstance(mode, Policy):
+        _run_processes(simulator_for(mode), processes, schedule, aging, stats)
+        return processes
+    if mode not in MODES:
+        raise ValueError(f"Unknown scheduling mode: {mode}")
+    MODES[mode](processes, schedule, aging, stats)
+    return processes
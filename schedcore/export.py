@@ -0,0 +1,334 @@
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+
+from .engines import simulator_for
+from .table import ProcessTable, run_table
+from .timeline import Timeline
+
+# Streaming export of schedule results. export_schedule() writes each job's
+# row as the engine completes it and each Gantt segment once the next one
+# starts, in chunks of chunk_rows rows, so only one chunk per file is held in
+# memory; with a plain job iterable as input nothing grows with the run but
+# the ready queue.
+#
+# Columnar file (.pscf): header, the schema as a JSON list of [name, type],
+# then chunks. A chunk is its row count (uint64) followed, per column, by the
+# column's buffers, each a uint64 byte length, the bytes and padding to 8
+# bytes. "f8" and "i8" columns are one float64/int64 buffer; "str" columns
+# are int64 offsets into a UTF-8 buffer, as in Arrow. A chunk of zero rows
+# ends the file, so a file cut short by a crash is refused on read.
+
+EXPORT_MAGIC = b"PSCF"
+EXPORT_VERSION = 1
+EXPORT_FORMATS = ("columnar", "csv")
+CHUNK_ROWS = 65536
+_HEADER = struct.Struct("<4sHBxI")   # magic, version, byte order, schema size
+_LENGTH = struct.Struct("<Q")
+_TYPECODES = {"f8": "d", "i8": "q"}
+
+JOB_SCHEMA = (("pid", "str"), ("arrival_time", "f8"), ("burst_time", "f8"), ("priority", "i8"),
+              ("start_time", "f8"), ("completion_time", "f8"), ("waiting_time", "f8"), ("turnaround_time", "f8"))
+SEGMENT_SCHEMA = (("pid", "str"), ("start", "f8"), ("end", "f8"))
+
+def _padding(offset):
+    return -offset % 8
+
+def _byteorder():
+    return 0 if sys.byteorder == "little" else 1
+
+class ColumnarWriter:
+    def __init__(self, path, schema, chunk_rows=CHUNK_ROWS):
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        self.path = path
+        self.schema = tuple(schema)
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self._buffer = []
+        encoded = json.dumps([list(field) for field in self.schema]).encode("utf-8")
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(EXPORT_MAGIC, EXPORT_VERSION, _byteorder(), len(encoded)))
+        self._file.write(encoded + bytes(_padding(_HEADER.size + len(encoded))))
+
+    def append(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        rows = self._buffer
+        if not rows:
+            return
+        parts = [_LENGTH.pack(len(rows))]
+        for (_, kind), column in zip(self.schema, zip(*rows)):
+            if kind == "str":
+                data = [str(value).encode("utf-8") for value in column]
+                offsets = array("q", [0])
+                offsets.extend(accumulate(map(len, data)))
+                buffers = (offsets.tobytes(), b"".join(data))
+            else:
+                buffers = (array(_TYPECODES[kind], column).tobytes(),)
+            for buffer in buffers:
+                parts += (_LENGTH.pack(len(buffer)), buffer, bytes(_padding(len(buffer))))
+        self._file.write(b"".join(parts))
+        self.rows += len(rows)
+        rows.clear()
+
+    def close(self, complete=True):
+        # complete=False leaves the file without its end marker, marking it
+        # as unusable
+        if self._file is None:
+            return
+        try:
+            if complete:
+                self.flush()
+                self._file.write(_LENGTH.pack(0))
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(exc_type is None)
+
+class CsvWriter:
+    # Same interface as ColumnarWriter
+    def __init__(self, path, schema, chunk_rows=CHUNK_ROWS):
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be at least 1")
+        self.path = path
+        self.schema = tuple(schema)
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self._buffer = []
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _ in self.schema])
+
+    def append(self, row):
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        self._writer.writerows(self._buffer)
+        self.rows += len(self._buffer)
+        self._buffer.clear()
+
+    def close(self, complete=True):
+        if self._file is None:
+            return
+        try:
+            if complete:
+                self.flush()
+        finally:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(exc_type is None)
+
+def export_format(path):
+    return "csv" if path.lower().endswith(".csv") else "columnar"
+
+def open_writer(path, schema, format=None, chunk_rows=CHUNK_ROWS):
+    format = format or export_format(path)
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {format}")
+    return (CsvWriter if format == "csv" else ColumnarWriter)(path, schema, chunk_rows)
+
+class TimelineExport:
+    # Segment sink for an engine's schedule argument. Segments are merged as
+    # Timeline.add merges them, so a segment is written once the next one
+    # starts (or at close).
+    def __init__(self, writer):
+        self.writer = writer
+        self._last = None
+
+    def add(self, pid, start, end):
+        if end <= start:
+            return
+        last = self._last
+        if last is not None and last[0] == pid and last[2] == start:
+            last[2] = end
+            return
+        if last is not None:
+            self.writer.append(tuple(last))
+        self._last = [pid, start, end]
+
+    def close(self, complete=True):
+        if complete and self._last is not None:
+            self.writer.append(tuple(self._last))
+            self._last = None
+        self.writer.close(complete)
+
+def _exported(results, writer):
+    append = writer.append
+    for job, start, completion in results:
+        turnaround = completion - job[1]
+        append((job[0], job[1], job[2], job[3], start, completion, turnaround - job[2], turnaround))
+        yield job, start, completion
+
+def export_schedule(source, mode, jobs_path=None, timeline_path=None, format=None, progress=None, aging=0.0,
+                    stats=None, chunk_rows=CHUNK_ROWS):
+    # Runs mode (a name or Policy) over source and streams per-job results to
+    # jobs_path and the timeline to timeline_path (either may be None). The
+    # format follows each path's extension unless given. source is a
+    # ProcessTable, which is filled in and returned as by schedule_table, or
+    # an iterable of (pid, arrival, burst, priority) jobs in arrival order,
+    # in which case the number of jobs completed is returned.
+    simulator = simulator_for(mode)
+    writers = []
+    try:
+        jobs_writer = open_writer(jobs_path, JOB_SCHEMA, format, chunk_rows) if jobs_path else None
+        if jobs_writer is not None:
+            writers.append(jobs_writer)
+        timeline = None
+        if timeline_path:
+            timeline = TimelineExport(open_writer(timeline_path, SEGMENT_SCHEMA, format, chunk_rows))
+            writers.append(timeline)
+
+        def simulate(jobs):
+            results = simulator(jobs, timeline, aging, stats)
+            return _exported(results, jobs_writer) if jobs_writer is not None else results
+
+        if isinstance(source, ProcessTable):
+            result = run_table(source, simulate, progress)
+        else:
+            result = 0
+            for _ in simulate(iter(source)):
+                result += 1
+    except BaseException:
+        for writer in writers:
+            writer.close(complete=False)
+        raise
+    for writer in writers:
+        writer.close()
+    return result
+
+def _read_buffer(view, offset, path):
+    # The buffer at offset as a slice of view, and the offset after it
+    if offset + _LENGTH.size > len(view):
+        raise ValueError(f"Export file is truncated: {path}")
+    size, = _LENGTH.unpack_from(view, offset)
+    offset += _LENGTH.size
+    if offset + size > len(view):
+        raise ValueError(f"Export file is truncated: {path}")
+    return view[offset:offset + size], offset + size + _padding(size)
+
+def _columnar_chunks(path):
+    # The file is memory-mapped and read one chunk at a time; each chunk's
+    # columns are copied out of the mapping, which is released at the end
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _HEADER.size:
+            raise ValueError(f"Not an export file: {path}")
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        with memoryview(data) as view:
+            yield from _mapped_chunks(view, path)
+    finally:
+        data.close()
+
+def _mapped_chunks(view, path):
+    magic, version, byteorder, schema_size = _HEADER.unpack_from(view)
+    if magic != EXPORT_MAGIC or version != EXPORT_VERSION:
+        raise ValueError(f"Not an export file: {path}")
+    if byteorder != _byteorder():
+        raise ValueError("Export file was written with a different byte order")
+    offset = _HEADER.size
+    schema = [tuple(field) for field in json.loads(bytes(view[offset:offset + schema_size]).decode("utf-8"))]
+    offset += schema_size + _padding(_HEADER.size + schema_size)
+    yield schema
+    while True:
+        if offset + _LENGTH.size > len(view):
+            raise ValueError(f"Export file is truncated: {path}")
+        rows, = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        if not rows:
+            return
+        chunk = {}
+        for name, kind in schema:
+            if kind == "str":
+                offsets, offset = _read_buffer(view, offset, path)
+                encoded, offset = _read_buffer(view, offset, path)
+                with offsets, encoded:
+                    bounds = array("q")
+                    bounds.frombytes(offsets)
+                    text = bytes(encoded)
+                chunk[name] = [text[bounds[i]:bounds[i + 1]].decode("utf-8") for i in range(rows)]
+            else:
+                buffer, offset = _read_buffer(view, offset, path)
+                column = array(_TYPECODES[kind])
+                with buffer:
+                    column.frombytes(buffer)
+                chunk[name] = column
+        yield chunk
+
+def _csv_chunks(path, chunk_rows):
+    known = dict(JOB_SCHEMA + SEGMENT_SCHEMA)
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        names = next(reader, None)
+        if names is None:
+            raise ValueError(f"Export file is empty: {path}")
+        schema = [(name, known.get(name, "str")) for name in names]
+        yield schema
+        while True:
+            rows = [row for _, row in zip(range(chunk_rows), reader)]
+            if not rows:
+                return
+            chunk = {}
+            for (name, kind), column in zip(schema, zip(*rows)):
+                if kind == "str":
+                    chunk[name] = list(column)
+                elif kind == "i8":
+                    chunk[name] = array("q", map(int, column))
+                else:
+                    chunk[name] = array("d", map(float, column))
+            yield chunk
+
+def iter_export(path, chunk_rows=CHUNK_ROWS):
+    # Yields the file's chunks as {column: values}; numeric columns are
+    # arrays, string columns lists
+    chunks = _csv_chunks(path, chunk_rows) if export_format(path) == "csv" else _columnar_chunks(path)
+    next(chunks)
+    yield from chunks
+
+def read_export(path):
+    # Whole file as {column: values}
+    chunks = _csv_chunks(path, CHUNK_ROWS) if export_format(path) == "csv" else _columnar_chunks(path)
+    columns = {name: [] if kind == "str" else array(_TYPECODES[kind]) for name, kind in next(chunks)}
+    for chunk in chunks:
+        for name, values in chunk.items():
+            columns[name].extend(values)
+    return columns
+
+def read_job_results(path):
+    # A jobs export as a scheduled ProcessTable, e.g. for compute_metrics
+    columns = read_export(path)
+    table = ProcessTable.from_columns(columns["arrival_time"], columns["burst_time"], columns["priority"],
+                                      labels=columns["pid"])
+    for name in ("start_time", "completion_time", "waiting_time", "turnaround_time"):
+        setattr(table, name, array("d", columns[name]))
+    return table
+
+def read_timeline_export(path):
+    columns = read_export(path)
+    timeline = Timeline()
+    intern = timeline.intern
+    timeline.starts = array("d", columns["start"])
+    timeline.ends = array("d", columns["end"])
+    timeline.pids = array("I", map(intern, columns["pid"]))
+    return timeline
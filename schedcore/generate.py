@@ -0,0 +1,72 @@
+import itertools
+import math
+import random
+
+from .table import ProcessTable
+
+# Seeded synthetic workloads. Columns are drawn in bulk straight into a
+# ProcessTable (integer PIDs), so no Process objects are created. The same
+# seed and parameters always give the same table.
+
+def _burst_sampler(rng, distribution, mean, sigma, shape):
+    if distribution == "exponential":
+        rate = 1.0 / mean
+        return lambda: rng.expovariate(rate)
+    if distribution == "lognormal":
+        mu = math.log(mean) - sigma * sigma / 2
+        return lambda: rng.lognormvariate(mu, sigma)
+    if distribution == "pareto":
+        if shape <= 1:
+            raise ValueError("Pareto shape must be greater than 1 for a finite mean")
+        scale = mean * (shape - 1) / shape
+        return lambda: scale * rng.paretovariate(shape)
+    if distribution == "constant":
+        return lambda: mean
+    raise ValueError(f"Unknown burst distribution: {distribution}")
+
+def _priority_mix(priorities):
+    # int -> uniform over 0..n-1, dict -> {priority: weight}, else weights by index
+    if isinstance(priorities, int):
+        if priorities < 1:
+            raise ValueError("Need at least one priority level")
+        return list(range(priorities)), None
+    if isinstance(priorities, dict):
+        return list(priorities), list(priorities.values())
+    weights = list(priorities)
+    return list(range(len(weights))), weights
+
+def generate_table(n, seed=None, arrival_rate=1.0, burst="exponential", burst_mean=5.0,
+                   burst_sigma=1.0, burst_shape=2.5, min_burst=1e-3, priorities=5):
+    # Poisson arrivals at arrival_rate jobs per time unit starting at 0, bursts
+    # from the named distribution with the given mean (clamped to min_burst)
+    if n < 0:
+        raise ValueError("Job count must be non-negative")
+    if arrival_rate <= 0 or burst_mean <= 0:
+        raise ValueError("Arrival rate and burst mean must be positive")
+    rng = random.Random(seed)
+    expovariate = rng.expovariate
+    gaps = [expovariate(arrival_rate) for _ in range(n)]
+    if gaps:
+        gaps[0] = 0.0
+    arrival = itertools.accumulate(gaps)
+
+    sample = _burst_sampler(rng, burst, burst_mean, burst_sigma, burst_shape)
+    bursts = [max(sample(), min_burst) for _ in range(n)]
+
+    levels, weights = _priority_mix(priorities)
+    priority = rng.choices(levels, weights, k=n)
+    return ProcessTable.from_columns(list(arrival), bursts, priority)
+
+class SyntheticWorkload:
+    # Picklable generate_table call with fixed parameters; calling it with a
+    # seed returns a table, which makes it usable as a run_sweep workload
+    def __init__(self, n, **params):
+        self.n = n
+        self.params = params
+
+    def __call__(self, seed=None):
+        return generate_table(self.n, seed, **self.params)
+
+    def __repr__(self):
+        params = "".join(f", {k}={v!r}" for k, v in self.params.items())
+        return f"SyntheticWorkload({self.n}{params})"
@@ -0,0 +1,165 @@
+from bisect import bisect_right
+from itertools import islice
+
+from .engines import SIMULATORS
+
+# Incremental scheduling for what-if analysis: jobs can be added after a run
+# and only the part of the schedule from the earliest new arrival onwards is
+# simulated again.
+#
+# The priority engines are run with a checkpoint hook (see engines.py) that
+# records the clock, arrival cursor, ready queue, running job and output
+# lengths every `checkpoint_interval` events. Adding a job with arrival a
+# invalidates nothing before time a, so the next run restores the latest
+# checkpoint at or before a, truncates the results and timeline to what they
+# were at that point and resumes the engine from there.
+#
+# Jobs are stored as (pid, arrival, burst, priority, seq, ref) sorted by
+# (arrival, seq). seq is the submission order, so ties break exactly as they
+# do when the whole list is scheduled from scratch.
+#
+# The other policies have no checkpoints and are simply rescheduled from the
+# start on every run.
+
+PROGRESS_INTERVAL = 1024
+CHECKPOINTED = ("Non-Preemptive", "Preemptive")
+
+class Checkpoint:
+    __slots__ = ("clock", "cursor", "ready", "current", "results", "segments", "last_end")
+
+    def __init__(self, clock, cursor, ready, current, results, segments, last_end):
+        self.clock = clock
+        self.cursor = cursor
+        self.ready = ready
+        self.current = current
+        self.results = results
+        self.segments = segments
+        self.last_end = last_end
+
+class IncrementalScheduler:
+    def __init__(self, mode, checkpoint_interval=256, aging=0.0):
+        if mode not in SIMULATORS:
+            raise ValueError(f"Unknown scheduling mode: {mode}")
+        if checkpoint_interval < 1:
+            raise ValueError("Checkpoint interval must be at least 1")
+        self.mode = mode
+        self.checkpoint_interval = checkpoint_interval
+        self.aging = aging
+        self.reset()
+
+    def reset(self):
+        self.jobs = []
+        self.arrivals = []
+        self.results = []
+        self.schedule = []
+        self.sources = {}
+        self.changed_from = 0
+        self._seq = 0
+        self._dirty = None
+        self.checkpoints = [Checkpoint(0.0, 0, [], None, 0, 0, None)]
+        self._checkpoint_clocks = [0.0]
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add_job(self, pid, arrival_time, burst_time, priority, ref=None):
+        # Queues a job; the schedule is brought up to date by run()
+        job = (pid, arrival_time, burst_time, priority, self._seq, ref)
+        self._seq += 1
+        position = bisect_right(self.arrivals, arrival_time)
+        self.arrivals.insert(position, arrival_time)
+        self.jobs.insert(position, job)
+        if self._dirty is None or arrival_time < self._dirty:
+            self._dirty = arrival_time
+        return job
+
+    def add(self, pid, arrival_time, burst_time, priority, ref=None):
+        job = self.add_job(pid, arrival_time, burst_time, priority, ref)
+        self.run()
+        return job
+
+    def run(self, progress=None, stats=None):
+        # Re-simulates from the latest checkpoint not after the earliest
+        # change. results[changed_from:] are the completions redone since the
+        # last apply(). stats, if given, covers only the re-simulated part.
+        if self._dirty is None:
+            return self.results
+        index = bisect_right(self._checkpoint_clocks, self._dirty) - 1
+        checkpoint = self.checkpoints[index]
+        del self.checkpoints[index + 1:]
+        del self._checkpoint_clocks[index + 1:]
+        del self.results[checkpoint.results:]
+        del self.schedule[checkpoint.segments:]
+        if checkpoint.segments:
+            self.schedule[-1]["end"] = checkpoint.last_end
+        self.changed_from = min(self.changed_from, checkpoint.results)
+        simulator = SIMULATORS[self.mode]
+        if self.mode in CHECKPOINTED:
+            jobs = islice(self.jobs, checkpoint.cursor, None)
+            completions = simulator(jobs, self.schedule, self.aging, stats, _Resume(self, checkpoint))
+        else:
+            completions = simulator(self.jobs, self.schedule, self.aging, stats)
+        results, n = self.results, len(self.jobs)
+        for result in completions:
+            results.append(result)
+            if progress is not None and len(results) % PROGRESS_INTERVAL == 0:
+                progress(len(results), n)
+        if progress is not None:
+            progress(len(results), n)
+        self._dirty = None
+        return self.results
+
+    def update(self, processes, progress=None, stats=None):
+        # Brings the schedule up to date with a Process list without touching
+        # the Process objects: processes not seen before are added, and if any
+        # were removed everything restarts
+        current = {id(p): p for p in processes}
+        if any(key not in current for key in self.sources):
+            self.reset()
+        for key, p in current.items():
+            if key not in self.sources:
+                self.sources[key] = p
+                self.add_job(p.pid, p.arrival_time, p.burst_time, p.priority, p)
+        return self.run(progress, stats)
+
+    def sync(self, processes, progress=None, full=False, stats=None):
+        # update() + apply(): returns the processes in completion order with
+        # their result fields refreshed, like run_schedule
+        self.update(processes, progress, stats)
+        return self.apply(full)
+
+    def apply(self, full=False):
+        # Writes results[changed_from:] (everything if full, e.g. after another
+        # scheduler wrote to the same processes) back onto their Process objects
+        first = 0 if full else self.changed_from
+        for job, start, completion in self.results[first:]:
+            p = job[5]
+            if p is None:
+                continue
+            p.remaining_time = 0
+            p.start_time = start
+            p.completion_time = completion
+            p.turnaround_time = completion - p.arrival_time
+            p.waiting_time = p.turnaround_time - p.burst_time
+        self.changed_from = len(self.results)
+        return [job[5] for job, _, _ in self.results]
+
+class _Resume:
+    # Engine checkpoint object for one run: starts from checkpoint and records
+    # new checkpoints on the scheduler. Results are appended as the engine
+    # yields them, so they are complete whenever save() is called.
+    def __init__(self, scheduler, checkpoint):
+        self.scheduler = scheduler
+        self.checkpoint = checkpoint
+        self.interval = scheduler.checkpoint_interval
+
+    def restore(self):
+        checkpoint = self.checkpoint
+        return checkpoint.clock, checkpoint.cursor, list(checkpoint.ready), checkpoint.current
+
+    def save(self, clock, seq, ready, current):
+        scheduler = self.scheduler
+        schedule = scheduler.schedule
+        scheduler.checkpoints.append(Checkpoint(clock, seq, list(ready), current, len(scheduler.results),
+                                                len(schedule), schedule[-1]["end"] if schedule else None))
+        scheduler._checkpoint_clocks.append(clock)
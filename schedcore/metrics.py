@@ -0,0 +1,152 @@
+from .table import ProcessTable
+from .timeline import Timeline
+
+PERCENTILES = (50, 95, 99)
+
+def percentile(sorted_values, q):
+    # Linear interpolation between closest ranks; expects sorted input
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    fraction = position - lower
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * fraction
+
+def distribution(values):
+    values = sorted(values)
+    stats = {"mean": sum(values) / len(values) if values else 0.0}
+    for q in PERCENTILES:
+        stats[f"p{q}"] = percentile(values, q)
+    stats["max"] = values[-1] if values else 0.0
+    return stats
+
+class MetricsReport:
+    def __init__(self, count, waiting, turnaround, response, busy_time, makespan, by_priority=None, cpus=1,
+                 overhead_time=0.0):
+        self.count = count
+        self.waiting = waiting
+        self.turnaround = turnaround
+        self.response = response
+        self.busy_time = busy_time
+        self.makespan = makespan
+        self.cpus = cpus
+        self.overhead_time = overhead_time
+        # The CPU is busy during context switches too, but only job time is
+        # useful work
+        capacity = makespan * cpus
+        self.cpu_utilization = (busy_time + overhead_time) / capacity if makespan > 0 else 0.0
+        self.effective_utilization = busy_time / capacity if makespan > 0 else 0.0
+        self.throughput = count / makespan if makespan > 0 else 0.0
+        self.by_priority = by_priority or {}
+
+    @property
+    def avg_waiting(self):
+        return self.waiting["mean"]
+
+    @property
+    def avg_turnaround(self):
+        return self.turnaround["mean"]
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "waiting": self.waiting,
+            "turnaround": self.turnaround,
+            "response": self.response,
+            "busy_time": self.busy_time,
+            "makespan": self.makespan,
+            "cpus": self.cpus,
+            "cpu_utilization": self.cpu_utilization,
+            "overhead_time": self.overhead_time,
+            "effective_utilization": self.effective_utilization,
+            "throughput": self.throughput,
+            "by_priority": {priority: report.as_dict() for priority, report in self.by_priority.items()},
+        }
+
+    def summary(self):
+        text = (f"Average Waiting Time: {self.avg_waiting:.2f} | Average Turnaround Time: {self.avg_turnaround:.2f}\n"
+                f"P95 Waiting: {self.waiting['p95']:.2f} | P95 Turnaround: {self.turnaround['p95']:.2f} | "
+                f"CPU Utilization: {self.cpu_utilization:.1%} | Throughput: {self.throughput:.3f}/unit")
+        if self.overhead_time:
+            text += (f"\nSwitch/Dispatch Overhead: {self.overhead_time:.2f} | "
+                     f"Effective Utilization: {self.effective_utilization:.1%}")
+        return text
+
+def _rows(source):
+    if isinstance(source, ProcessTable):
+        return zip(source.arrival_time, source.burst_time, source.priority, source.start_time,
+                   source.completion_time)
+    return ((p.arrival_time, p.burst_time, p.priority, p.start_time, p.completion_time) for p in source)
+
+class _Totals:
+    # Per-job times and running totals for one report
+    __slots__ = ("waiting", "turnaround", "response", "busy_time", "first_arrival", "last_completion")
+
+    def __init__(self):
+        self.waiting = []
+        self.turnaround = []
+        self.response = []
+        self.busy_time = 0.0
+        self.first_arrival = float("inf")
+        self.last_completion = float("-inf")
+
+    def add(self, arrival, burst, waiting, turnaround, response, completion):
+        self.waiting.append(waiting)
+        self.turnaround.append(turnaround)
+        self.response.append(response)
+        self.busy_time += burst
+        if arrival < self.first_arrival:
+            self.first_arrival = arrival
+        if completion > self.last_completion:
+            self.last_completion = completion
+
+    def report(self, by_priority=None, cpus=1, overhead=0.0):
+        makespan = self.last_completion - self.first_arrival if self.waiting else 0.0
+        return MetricsReport(len(self.waiting), distribution(self.waiting), distribution(self.turnaround),
+                             distribution(self.response), self.busy_time, makespan, by_priority, cpus, overhead)
+
+def overhead_time(schedule):
+    # Total length of the "Overhead" segments in a timeline (a Timeline or a
+    # list of segment dicts)
+    if isinstance(schedule, Timeline):
+        if "Overhead" not in schedule.labels:
+            return 0.0
+        index = schedule.labels.index("Overhead")
+        return sum(end - start for start, end, pid in zip(schedule.starts, schedule.ends, schedule.pids)
+                   if pid == index)
+    return sum(s["end"] - s["start"] for s in schedule if s["pid"] == "Overhead")
+
+def compute_metrics(source, by_priority=True, cpus=1, overhead=0.0):
+    # source is a scheduled ProcessTable or list of Process objects; rows that
+    # have not completed yet (None or NaN completion) are left out. cpus scales
+    # utilization for multi-CPU schedules. overhead is the context-switch and
+    # dispatch time the schedule spent (see overhead_time); it is not broken
+    # down by priority.
+    #
+    # One pass over the rows fills the overall and per-priority totals; only
+    # the percentiles sort afterwards.
+    total = _Totals()
+    classes = {}
+    for arrival, burst, priority, start, completion in _rows(source):
+        if completion is None or completion != completion:
+            continue
+        turnaround = completion - arrival
+        row = (arrival, burst, turnaround - burst, turnaround, start - arrival, completion)
+        total.add(*row)
+        if by_priority:
+            group = classes.get(priority)
+            if group is None:
+                group = classes[priority] = _Totals()
+            group.add(*row)
+    reports = None
+    if len(classes) > 1:
+        reports = {priority: classes[priority].report(cpus=cpus) for priority in sorted(classes)}
+    return total.report(reports, cpus, overhead)
+
+def average_times(processes):
+    # Returns (average waiting time, average turnaround time)
+    if not processes:
+        return 0.0, 0.0
+    report = compute_metrics(processes, by_priority=False)
+    return report.avg_waiting, report.avg_turnaround
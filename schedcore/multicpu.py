@@ -0,0 +1,164 @@
+import heapq
+
+from .engines import _next_job
+from .table import run_table
+from .timeline import segment_writer
+
+# Priority scheduling over several CPUs, driven by the same arrival/completion
+# events as the single-CPU engines. With one CPU it produces exactly the same
+# schedule as simulate_preemptive / simulate_non_preemptive.
+#
+# Global scheduling (the default) keeps one ready queue shared by all CPUs, so
+# a preempted job may resume on any CPU. To find the CPU to preempt, running
+# jobs are also kept in a max-heap ordered by how low their priority is
+# ("victims"), with stale entries skipped lazily, so each preemption check is
+# O(log n) rather than a scan over the CPUs.
+#
+# Partitioned scheduling gives each CPU its own ready queue. Arriving jobs go
+# to an idle CPU if there is one, otherwise to the shortest queue. With
+# migrate=True a CPU whose queue runs dry steals the best job from the
+# longest other queue.
+
+def _lanes(schedule, cpus):
+    # schedule is None, an empty list (filled with one dict list per CPU) or
+    # a list of cpus lanes, each a dict list or a Timeline
+    if schedule is None:
+        return None
+    if not schedule:
+        schedule.extend([] for _ in range(cpus))
+    if len(schedule) != cpus:
+        raise ValueError("Need one timeline lane per CPU")
+    return schedule
+
+def simulate_multiprocessor(jobs, schedule=None, cpus=2, preemptive=True, partitioned=False, migrate=True):
+    if cpus < 1:
+        raise ValueError("Need at least one CPU")
+    lanes = _lanes(schedule, cpus)
+    emit = [segment_writer(lane) for lane in lanes] if lanes is not None else [segment_writer(None)] * cpus
+    jobs = iter(jobs)
+    pending = _next_job(jobs, 0.0)
+    queues = [[] for _ in range(cpus if partitioned else 1)]
+    running = [None] * cpus        # [priority, arrival, seq, job, remaining, first start, slice start]
+    tokens = [None] * cpus         # identifies the current dispatch on each CPU
+    idle_since = [0.0] * cpus
+    idle = list(range(cpus))       # heap of idle CPU ids (global mode)
+    completions = []               # (finish, cpu, token)
+    victims = []                   # (-priority, -arrival, -seq, cpu, token)
+    seq = 0
+    dispatches = 0
+    inf = float("inf")
+
+    def start(cpu, entry, now):
+        nonlocal dispatches
+        priority, arrival, order, job, remaining, first = entry
+        if idle_since[cpu] is not None and now > idle_since[cpu]:
+            emit[cpu]("Idle", idle_since[cpu], now)
+        idle_since[cpu] = None
+        running[cpu] = [priority, arrival, order, job, remaining, now if first is None else first, now]
+        dispatches += 1
+        tokens[cpu] = dispatches
+        heapq.heappush(completions, (now + remaining, cpu, dispatches))
+        if preemptive and not partitioned:
+            heapq.heappush(victims, (-priority, -arrival, -order, cpu, dispatches))
+
+    def stop(cpu, now):
+        # Takes the running job off a CPU and returns its ready-queue entry
+        priority, arrival, order, job, remaining, first, slice_start = running[cpu]
+        emit[cpu](job[0], slice_start, now)
+        running[cpu] = None
+        tokens[cpu] = None
+        return (priority, arrival, order, job, remaining - (now - slice_start), first)
+
+    def fill(cpu, now):
+        # Partitioned mode: give an idle CPU work from its own queue, or steal
+        queue = queues[cpu]
+        if not queue and migrate:
+            donor = max(range(cpus), key=lambda q: len(queues[q]))
+            queue = queues[donor]
+        if queue:
+            start(cpu, heapq.heappop(queue), now)
+        elif idle_since[cpu] is None:
+            idle_since[cpu] = now
+
+    while pending is not None or completions:
+        while completions and tokens[completions[0][1]] != completions[0][2]:
+            heapq.heappop(completions)
+        next_completion = completions[0][0] if completions else inf
+        next_arrival = pending[1] if pending is not None else inf
+        now = min(next_completion, next_arrival)
+        if now == inf:
+            break
+
+        freed = []
+        while completions and completions[0][0] <= now:
+            finish, cpu, token = heapq.heappop(completions)
+            if tokens[cpu] != token:
+                continue
+            job, first, slice_start = running[cpu][3], running[cpu][5], running[cpu][6]
+            emit[cpu](job[0], slice_start, finish)
+            running[cpu] = None
+            tokens[cpu] = None
+            idle_since[cpu] = finish
+            freed.append(cpu)
+            yield job, first, finish
+
+        touched = set(freed)
+        while pending is not None and pending[1] <= now:
+            entry = (pending[3], pending[1], seq, pending, pending[2], None)
+            seq += 1
+            if partitioned:
+                # Prefer an idle CPU, then the shortest queue
+                target = min(range(cpus), key=lambda c: (running[c] is not None, len(queues[c])))
+                heapq.heappush(queues[target], entry)
+                touched.add(target)
+            else:
+                heapq.heappush(queues[0], entry)
+            pending = _next_job(jobs, pending[1])
+
+        if partitioned:
+            for cpu in sorted(touched):
+                if running[cpu] is None:
+                    fill(cpu, now)
+                elif preemptive and queues[cpu] and queues[cpu][0][:3] < tuple(running[cpu][:3]):
+                    heapq.heappush(queues[cpu], stop(cpu, now))
+                    start(cpu, heapq.heappop(queues[cpu]), now)
+            if migrate:
+                # CPUs that went idle earlier can now steal newly queued work
+                for cpu in range(cpus):
+                    if running[cpu] is None:
+                        if not any(queues):
+                            break
+                        fill(cpu, now)
+            continue
+
+        ready = queues[0]
+        for cpu in freed:
+            heapq.heappush(idle, cpu)
+        while ready and idle:
+            start(heapq.heappop(idle), heapq.heappop(ready), now)
+        if preemptive:
+            while ready:
+                while victims and tokens[victims[0][3]] != victims[0][4]:
+                    heapq.heappop(victims)
+                if not victims:
+                    break
+                worst = victims[0]
+                if not ready[0][:3] < (-worst[0], -worst[1], -worst[2]):
+                    break
+                heapq.heappop(victims)
+                cpu = worst[3]
+                heapq.heappush(ready, stop(cpu, now))
+                start(cpu, heapq.heappop(ready), now)
+
+def lane_utilization(schedule, makespan):
+    # Busy fraction of each CPU lane over makespan
+    if makespan <= 0:
+        return [0.0 for _ in schedule]
+    return [sum(segment["end"] - segment["start"] for segment in lane if segment["pid"] != "Idle") / makespan
+            for lane in schedule]
+
+def schedule_table_multi(table, cpus, schedule=None, preemptive=True, partitioned=False, migrate=True,
+                         progress=None):
+    # schedule_table over several CPUs; schedule receives one lane per CPU
+    return run_table(table, lambda jobs: simulate_multiprocessor(jobs, schedule, cpus, preemptive,
+                                                                 partitioned, migrate), progress)
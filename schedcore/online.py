@@ -0,0 +1,155 @@
+import heapq
+import math
+
+from .policies import policy_for
+from .timeline import segment_writer
+
+# Online dispatcher: jobs are submitted while the clock runs instead of being
+# known up front. Submitted jobs wait in a heap keyed on arrival time until
+# the clock reaches them; the ready queue is the same heap simulate_policy
+# uses. Each submission and each decision is O(log n).
+#
+# A replay driver submits the trace and calls next_decision() until it
+# returns None. A live driver sleeps until next_event_time (or the next
+# submission), calls advance(now) to bring the clock forward and submits or
+# decides. With every job submitted before the clock reaches it, the result
+# is the batch engine's schedule.
+
+class Decision:
+    # At `time` the CPU runs `job` (None: idle); `completed` is the
+    # (job, start, completion) that finished at `time`, if any
+    __slots__ = ("time", "job", "completed")
+
+    def __init__(self, time, job, completed):
+        self.time = time
+        self.job = job
+        self.completed = completed
+
+    def __repr__(self):
+        pid = self.job[0] if self.job is not None else None
+        return f"Decision(time={self.time!r}, pid={pid!r}, completed={self.completed is not None})"
+
+class OnlineScheduler:
+    def __init__(self, mode="Preemptive", schedule=None):
+        self.policy = policy_for(mode)
+        if self.policy.has_overhead:
+            raise ValueError("The online dispatcher does not model switch or dispatch overhead")
+        self.schedule = schedule
+        self._emit = segment_writer(schedule)
+        self.clock = 0.0
+        self.pending = []     # (arrival, submission order, job)
+        self.ready = []       # (key, seq, job, remaining, first start, level)
+        self.current = None   # (key, seq, job, finish, first start, level)
+        self.slice_end = None
+        self.idle_since = 0.0
+        self._seq = 0
+        self._submitted = 0
+
+    def __len__(self):
+        # Jobs submitted but not finished
+        return len(self.pending) + len(self.ready) + (self.current is not None)
+
+    @property
+    def running(self):
+        return self.current[2] if self.current is not None else None
+
+    @property
+    def next_event_time(self):
+        # Next arrival, completion or quantum expiry; None when nothing is left
+        arrival = self.pending[0][0] if self.pending else None
+        if self.current is None:
+            return arrival
+        end = self.current[3] if self.slice_end is None else self.slice_end
+        return end if arrival is None or end < arrival else arrival
+
+    def submit(self, job):
+        # job is (pid, arrival, burst, priority, ...); it may not arrive
+        # before the current clock
+        if not (math.isfinite(job[1]) and math.isfinite(job[2])):
+            raise ValueError("Arrival and burst times must be finite")
+        if job[1] < self.clock:
+            raise ValueError("Job arrives before the scheduler's clock")
+        if job[2] <= 0:
+            raise ValueError("Burst time must be positive")
+        heapq.heappush(self.pending, (job[1], self._submitted, job))
+        self._submitted += 1
+        return job
+
+    def _move(self, time):
+        if self.current is not None and time > self.clock:
+            self._emit(self.current[2][0], self.clock, time)
+        self.clock = time
+
+    def next_decision(self):
+        # Moves the clock to the next event and applies everything that
+        # happens then: a completion or quantum expiry, arrivals, preemption
+        time = self.next_event_time
+        if time is None:
+            return None
+        self._move(time)
+        policy = self.policy
+        completed = None
+        if self.current is not None and self.slice_end is None and time >= self.current[3]:
+            key, order, job, finish, start, level = self.current
+            completed = (job, start, finish)
+            self.current = None
+            self.idle_since = time
+
+        pending, ready = self.pending, self.ready
+        while pending and pending[0][0] <= time:
+            job = heapq.heappop(pending)[2]
+            heapq.heappush(ready, (policy.key(job, job[2], 0), self._seq, job, job[2], None, 0))
+            self._seq += 1
+
+        if self.current is not None:
+            key, order, job, finish, start, level = self.current
+            remaining = finish - time
+            if self.slice_end is not None and time >= self.slice_end:
+                # Quantum used up: requeue behind this instant's arrivals
+                level = policy.demote(level)
+                if policy.requeue_at_tail:
+                    order = self._seq
+                    self._seq += 1
+                heapq.heappush(ready, (policy.key(job, remaining, level), order, job, remaining, start, level))
+                self.current = None
+            elif policy.preemptive and ready:
+                key = policy.key(job, remaining, level)
+                if ready[0][:2] < (key, order):
+                    if policy.requeue_at_tail:
+                        order = self._seq
+                        self._seq += 1
+                    heapq.heappush(ready, (key, order, job, remaining, start, level))
+                    self.current = None
+            if self.current is None:
+                self.idle_since = time
+
+        if self.current is None and ready:
+            key, order, job, remaining, start, level = heapq.heappop(ready)
+            if self.idle_since is not None and time > self.idle_since:
+                self._emit("Idle", self.idle_since, time)
+            self.idle_since = None
+            quantum = policy.quantum(level)
+            self.slice_end = time + quantum if quantum is not None and quantum < remaining else None
+            self.current = (key, order, job, time + remaining, time if start is None else start, level)
+        elif self.current is None:
+            self.slice_end = None
+        return Decision(time, self.running, completed)
+
+    def advance(self, to_time):
+        # Processes every event before to_time and returns the completions as
+        # (job, start, completion). Events at to_time itself wait for the next
+        # call, so jobs submitted at to_time are weighed together with them.
+        # The clock ends at to_time unless it is inf.
+        if to_time < self.clock:
+            raise ValueError("Cannot move the clock backwards")
+        completions = []
+        while True:
+            time = self.next_event_time
+            if time is None or time >= to_time:
+                break
+            decision = self.next_decision()
+            if decision.completed is not None:
+                completions.append(decision.completed)
+        if to_time != float("inf"):
+            self._move(to_time)
+        return completions
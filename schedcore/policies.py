@@ -0,0 +1,131 @@
+# Pluggable scheduling policies on one event loop. A policy decides:
+#   key(job, remaining, level)  ordering of ready jobs, smaller runs first
+#   preemptive                  whether a better ready job takes the CPU at an
+#                               arrival
+#   quantum(level)              time slice before the job is requeued, or None
+#   demote(level)               level after a job uses up its whole quantum
+#   requeue_at_tail             whether a requeued job goes behind jobs with an
+#                               equal key (round-robin) or keeps its place
+#   dispatch_cost               CPU time charged whenever a job is given the CPU
+#   switch_cost                 further time charged when that job is not the
+#                               one that last ran (see with_overhead)
+# engines.simulate_policy runs any policy; it wakes up only on arrivals,
+# completions, quantum expiries and the end of a switch.
+
+import copy
+import math
+
+class Policy:
+    name = None
+    preemptive = False
+    requeue_at_tail = False
+    dispatch_cost = 0.0
+    switch_cost = 0.0
+
+    def key(self, job, remaining, level):
+        raise NotImplementedError
+
+    def quantum(self, level):
+        return None
+
+    def demote(self, level):
+        return level
+
+    def with_overhead(self, switch=0.0, dispatch=0.0):
+        # Copy of this policy that charges context-switch and dispatch time
+        if not (math.isfinite(switch) and math.isfinite(dispatch)) or switch < 0 or dispatch < 0:
+            raise ValueError("Switch and dispatch costs must be finite and non-negative")
+        policy = copy.copy(self)
+        policy.switch_cost = float(switch)
+        policy.dispatch_cost = float(dispatch)
+        return policy
+
+    @property
+    def has_overhead(self):
+        return self.switch_cost > 0 or self.dispatch_cost > 0
+
+    def __repr__(self):
+        # Stable across runs, so a policy can be part of a cache key
+        options = ", ".join(f"{k}={v!r}" for k, v in vars(self).items())
+        return f"{type(self).__name__}({options})"
+
+class PriorityPolicy(Policy):
+    # Same order as Process.__lt__; the dedicated engines in engines.py are
+    # the fast path for this policy
+    def __init__(self, preemptive=False):
+        self.preemptive = preemptive
+        self.name = "Preemptive" if preemptive else "Non-Preemptive"
+
+    def key(self, job, remaining, level):
+        return (job[3], job[1])
+
+class ShortestJobFirst(Policy):
+    name = "SJF"
+
+    def key(self, job, remaining, level):
+        return (job[2], job[1])
+
+class ShortestRemainingTimeFirst(Policy):
+    name = "SRTF"
+    preemptive = True
+
+    def key(self, job, remaining, level):
+        return (remaining, job[1])
+
+class RoundRobin(Policy):
+    # Round-robin within each priority class; a higher class preempts
+    name = "Round Robin"
+    preemptive = True
+    requeue_at_tail = True
+
+    def __init__(self, quantum=2.0):
+        if not math.isfinite(quantum) or quantum <= 0:
+            raise ValueError("Quantum must be positive and finite")
+        self.time_slice = quantum
+
+    def key(self, job, remaining, level):
+        return (job[3],)
+
+    def quantum(self, level):
+        return self.time_slice
+
+class MultilevelFeedbackQueue(Policy):
+    # New jobs start in level 0; a job that uses its whole quantum drops a
+    # level, and each level's quantum is twice the one above it
+    name = "MLFQ"
+    preemptive = True
+    requeue_at_tail = True
+
+    def __init__(self, levels=3, quantum=2.0):
+        if levels < 1 or not math.isfinite(quantum) or quantum <= 0:
+            raise ValueError("MLFQ needs at least one level and a positive, finite quantum")
+        self.levels = levels
+        self.base_quantum = quantum
+
+    def key(self, job, remaining, level):
+        return (level,)
+
+    def quantum(self, level):
+        return self.base_quantum * 2 ** level
+
+    def demote(self, level):
+        return min(level + 1, self.levels - 1)
+
+POLICIES = {
+    "SJF": ShortestJobFirst,
+    "SRTF": ShortestRemainingTimeFirst,
+    "Round Robin": RoundRobin,
+    "MLFQ": MultilevelFeedbackQueue,
+}
+
+def policy_for(mode):
+    # Policy object for a mode name, including the two priority modes
+    if isinstance(mode, Policy):
+        return mode
+    if mode == "Non-Preemptive":
+        return PriorityPolicy(False)
+    if mode == "Preemptive":
+        return PriorityPolicy(True)
+    if mode in POLICIES:
+        return POLICIES[mode]()
+    raise ValueError(f"Unknown scheduling mode: {mode}")
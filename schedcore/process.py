@@ -0,0 +1,19 @@
+class Process:
+    # __slots__ keeps each instance free of a per-object __dict__
+    __slots__ = ("pid", "arrival_time", "burst_time", "remaining_time", "priority",
+                 "waiting_time", "turnaround_time", "start_time", "completion_time")
+
+    def __init__(self, pid, arrival_time, burst_time, priority):
+        self.pid = pid
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.remaining_time = burst_time
+        self.priority = priority
+        self.waiting_time = 0
+        self.turnaround_time = 0
+        self.start_time = None
+        self.completion_time = None
+
+    def __lt__(self, other):
+        # Priority Queue: smaller priority value = higher priority
+        return self.priority < other.priority if self.priority != other.priority else self.arrival_time < other.arrival_time
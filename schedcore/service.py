@@ -0,0 +1,369 @@
+import argparse
+import asyncio
+import functools
+import json
+import math
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .engines import SIMULATORS
+from .metrics import compute_metrics, overhead_time
+from .policies import policy_for
+from .stats import SimulationStats
+from .table import ProcessTable, schedule_table
+from .timeline import Timeline
+from .workload import parse_job
+
+# Local HTTP/JSON service: python -m schedcore.service --port 8765
+#
+#   GET  /health     {"status": "ok", "pending": n}
+#   GET  /modes      list of scheduling modes
+#   POST /schedule   {"jobs": [...], "modes": [...], "per_job": false,
+#                     "timeline": false, "stats": false, "aging": 0,
+#                     "switch_cost": 0, "dispatch_cost": 0}
+#
+# Jobs are objects with the trace field names or [pid, arrival, burst,
+# priority] lists. /schedule answers with chunked NDJSON: per mode a "result"
+# line with the metrics, then "jobs" and "timeline" lines of at most
+# chunk_size rows each, and finally {"type": "done"}. Modes stream back as
+# they finish.
+#
+# Each (workload, mode) pair is one task for a process pool, which also
+# encodes the response lines, so the event loop only moves bytes. Small tasks
+# arriving within batch_window seconds share one pool call. At most
+# max_pending tasks are queued or running in the pool (counted until the pool
+# finishes them, even if their request gave up); beyond that requests get a
+# 503.
+# Workloads are validated before they reach the pool, and a request whose
+# simulations take longer than task_timeout seconds gets a 504 (or, once
+# streaming, an error line).
+
+MAX_BODY = 64 * 1024 * 1024
+JOB_FIELDS = ("pid", "arrival", "burst", "priority")
+
+class _HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable",
+           504: "Gateway Timeout"}
+
+def _lines(objects):
+    return "".join(json.dumps(obj) + "\n" for obj in objects).encode("utf-8")
+
+def run_spec(spec):
+    # Runs one (workload, mode) task and returns its response as a list of
+    # encoded NDJSON chunks; spec["jobs"] holds parse_job() tuples
+    table = ProcessTable(labels=[])
+    for job in spec["jobs"]:
+        table.append(*job)
+    mode, size = spec["mode"], spec["chunk_size"]
+    charged = spec["switch_cost"] > 0 or spec["dispatch_cost"] > 0
+    timeline = Timeline() if spec["timeline"] or charged else None
+    stats = SimulationStats() if spec["stats"] else None
+    policy = policy_for(mode).with_overhead(spec["switch_cost"], spec["dispatch_cost"]) if charged else mode
+    schedule_table(table, policy, timeline, aging=spec["aging"], stats=stats)
+    overhead = overhead_time(timeline) if charged else 0.0
+    result = {"type": "result", "mode": mode, "metrics": compute_metrics(table, overhead=overhead).as_dict()}
+    if stats is not None:
+        result["stats"] = stats.as_dict()
+    chunks = [_lines([result])]
+    if spec["per_job"]:
+        rows = [[p.pid, p.start_time, p.completion_time, p.waiting_time, p.turnaround_time] for p in table]
+        chunks.extend(_lines([{"type": "jobs", "mode": mode, "rows": rows[i:i + size]}])
+                      for i in range(0, len(rows), size))
+    if spec["timeline"]:
+        segments = [[s["pid"], s["start"], s["end"]] for s in timeline]
+        chunks.extend(_lines([{"type": "timeline", "mode": mode, "segments": segments[i:i + size]}])
+                      for i in range(0, len(segments), size))
+    return chunks
+
+def run_specs(specs):
+    # One pool call for a batch of tasks; a failure fails only its task.
+    # Results are (status, chunks or message) with status "ok", "invalid"
+    # (a ValueError, reported as 400) or "error" (anything else, 500).
+    results = []
+    for spec in specs:
+        try:
+            results.append(("ok", run_spec(spec)))
+        except ValueError as e:
+            results.append(("invalid", str(e)))
+        except Exception as e:
+            results.append(("error", f"{type(e).__name__}: {e}"))
+    return results
+
+def parse_jobs(jobs):
+    # Request jobs (objects or [pid, arrival, burst, priority] lists) as
+    # job tuples; raises ValueError on the first bad one
+    parsed = []
+    for line, record in enumerate(jobs, 1):
+        if isinstance(record, (list, tuple)):
+            record = dict(zip(JOB_FIELDS, record))
+        elif not isinstance(record, dict):
+            raise ValueError(f"Job {line} must be an object or a list")
+        parsed.append(parse_job(record, line))
+    return parsed
+
+class ScheduleService:
+    def __init__(self, host="127.0.0.1", port=0, max_workers=None, max_pending=64, batch_window=0.005,
+                 batch_jobs=2000, batch_size=32, chunk_size=1000, task_timeout=60.0):
+        # max_workers=0 runs simulations on one thread instead of a process
+        # pool; tasks with fewer than batch_jobs jobs are batched
+        self.host = host
+        self.port = port
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.batch_window = batch_window
+        self.batch_jobs = batch_jobs
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.task_timeout = task_timeout
+        self.pending = 0
+        self.executor = None
+        self.server = None
+        self._batch = []
+        self._flush_handle = None
+
+    async def start(self):
+        if self.max_workers == 0:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            # Workers are started on demand; forked straight from this process
+            # they would inherit open client sockets and keep those
+            # connections from closing
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self.executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.host, self.port = self.server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if self.executor is not None:
+            # Waits for running simulations off the event loop
+            executor, self.executor = self.executor, None
+            await asyncio.get_running_loop().run_in_executor(
+                None, functools.partial(executor.shutdown, wait=True, cancel_futures=True))
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        await self.server.serve_forever()
+
+    def submit(self, spec):
+        # Returns a future for run_spec(spec)'s chunks
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending += 1
+        if len(spec["jobs"]) >= self.batch_jobs:
+            self._dispatch([(spec, future)])
+            return future
+        self._batch.append((spec, future))
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch = self._batch, []
+        # Tasks whose request already gave up never reach the pool
+        live = [item for item in batch if not item[1].done()]
+        self.pending -= len(batch) - len(live)
+        if live:
+            self._dispatch(live)
+
+    def _dispatch(self, items):
+        loop = asyncio.get_running_loop()
+        try:
+            work = loop.run_in_executor(self.executor, run_specs, [spec for spec, _ in items])
+        except Exception as e:
+            # e.g. the pool is broken or shut down
+            self.pending -= len(items)
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        def deliver(work):
+            # The pool is done with these tasks, whether or not anyone waits
+            self.pending -= len(items)
+            error = work.exception() if not work.cancelled() else asyncio.CancelledError()
+            for i, (_, future) in enumerate(items):
+                if future.done():
+                    continue  # the client went away
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    status, value = work.result()[i]
+                    if status == "ok":
+                        future.set_result(value)
+                    elif status == "invalid":
+                        future.set_exception(ValueError(value))
+                    else:
+                        future.set_exception(RuntimeError(value))
+        work.add_done_callback(deliver)
+
+    def parse_request(self, body):
+        # Validates a /schedule body and returns one spec per mode
+        try:
+            request = json.loads(body)
+        except ValueError:
+            raise _HTTPError(400, "Request body is not valid JSON") from None
+        if not isinstance(request, dict):
+            raise _HTTPError(400, "Request body must be a JSON object")
+        jobs = request.get("jobs")
+        if not isinstance(jobs, list) or not jobs:
+            raise _HTTPError(400, "jobs must be a non-empty list")
+        modes = request.get("modes", [request["mode"]] if "mode" in request else list(SIMULATORS))
+        if not isinstance(modes, list) or not modes:
+            raise _HTTPError(400, "modes must be a non-empty list")
+        for mode in modes:
+            if not isinstance(mode, str) or mode not in SIMULATORS:
+                raise _HTTPError(400, f"Unknown scheduling mode: {mode!r}")
+        options = {}
+        for name in ("aging", "switch_cost", "dispatch_cost"):
+            value = request.get(name, 0.0)
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+                raise _HTTPError(400, f"{name} must be a finite, non-negative number")
+            options[name] = float(value)
+        if options["aging"] and (options["switch_cost"] or options["dispatch_cost"]):
+            raise _HTTPError(400, "aging cannot be combined with switch or dispatch costs")
+        try:
+            jobs = parse_jobs(jobs)
+        except ValueError as e:
+            raise _HTTPError(400, str(e)) from None
+        return [{"jobs": jobs, "mode": mode, **options, "chunk_size": self.chunk_size,
+                 "per_job": bool(request.get("per_job")), "timeline": bool(request.get("timeline")),
+                 "stats": bool(request.get("stats"))} for mode in modes]
+
+    async def _handle(self, reader, writer):
+        try:
+            try:
+                method, path, body = await self._read_request(reader)
+                if path == "/health":
+                    self._expect(method, "GET")
+                    await self._send_json(writer, 200, {"status": "ok", "pending": self.pending})
+                elif path == "/modes":
+                    self._expect(method, "GET")
+                    await self._send_json(writer, 200, list(SIMULATORS))
+                elif path == "/schedule":
+                    self._expect(method, "POST")
+                    await self._schedule(writer, body)
+                else:
+                    raise _HTTPError(404, f"No such endpoint: {path}")
+            except _HTTPError as e:
+                await self._send_json(writer, e.status, {"error": str(e)})
+            except Exception as e:
+                await self._send_json(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _expect(method, allowed):
+        if method != allowed:
+            raise _HTTPError(405, f"Use {allowed}")
+
+    async def _read_request(self, reader):
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise _HTTPError(400, "Malformed request line") from None
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _HTTPError(400, "Invalid Content-Length") from None
+        if length > MAX_BODY:
+            raise _HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method, target.split("?", 1)[0], body
+
+    async def _send_json(self, writer, status, obj):
+        body = json.dumps(obj).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+
+    async def _schedule(self, writer, body):
+        specs = self.parse_request(body)
+        if self.pending + len(specs) > self.max_pending:
+            raise _HTTPError(503, "Too many simulations queued, try again later")
+        futures = [self.submit(spec) for spec in specs]
+        deadline = asyncio.get_running_loop().time() + self.task_timeout
+        try:
+            # The first task to finish decides the status: a workload error
+            # is the same for every mode
+            done, _ = await asyncio.wait(futures, timeout=self.task_timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                raise _HTTPError(504, "Simulation timed out")
+            first = done.pop()
+            error = first.exception()
+            if isinstance(error, ValueError):
+                raise _HTTPError(400, str(error))
+            if error is not None:
+                raise _HTTPError(500, str(error))
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                         b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+            remaining = max(deadline - asyncio.get_running_loop().time(), 0.0)
+            for future in asyncio.as_completed(futures, timeout=remaining):
+                try:
+                    chunks = await future
+                except asyncio.TimeoutError:
+                    chunks = [_lines([{"type": "error", "error": "Simulation timed out"}])]
+                except Exception as e:
+                    chunks = [_lines([{"type": "error", "error": str(e)}])]
+                for chunk in chunks:
+                    writer.write(b"%X\r\n%s\r\n" % (len(chunk), chunk))
+                    await writer.drain()
+            done_line = _lines([{"type": "done"}])
+            writer.write(b"%X\r\n%s\r\n0\r\n\r\n" % (len(done_line), done_line))
+            await writer.drain()
+        finally:
+            for future in futures:
+                future.cancel()
+
+async def serve(host="127.0.0.1", port=8765, **options):
+    service = ScheduleService(host, port, **options)
+    host, port = await service.start()
+    print(f"Serving on http://{host}:{port}", file=sys.stderr)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve schedule simulations over local HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, help="simulation processes (default: one per CPU; 0 = one thread)")
+    parser.add_argument("--max-pending", type=int, default=64, help="queued simulations before returning 503")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds a request's simulations may take")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, max_workers=args.workers, max_pending=args.max_pending,
+                          task_timeout=args.timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
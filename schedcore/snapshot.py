@@ -0,0 +1,301 @@
+import os
+import struct
+import zlib
+from array import array
+from itertools import repeat
+
+from .cache import fingerprint
+from .engines import SIMULATORS
+from .incremental import Checkpoint
+from .table import PROGRESS_INTERVAL, arrival_order, table_jobs
+from .timeline import Timeline, segment_writer
+
+# Resumable runs for long replays. schedule_table_resumable() drives a
+# priority engine over a ProcessTable and every `interval` engine events
+# appends a snapshot record to an append-only file:
+#
+#   clock, jobs taken so far, ready queue and running job (by table row),
+#   running totals of the metrics, the completions since the previous record
+#   and the timeline segments from the previous record's last one on
+#
+# so a record costs O(work since the last one + ready queue), not O(run).
+# After a crash the same call replays the records into the table and
+# timeline and restarts the engine from the last complete one. Records carry
+# a length and CRC32, so a record torn by the crash is ignored.
+
+SNAPSHOT_MAGIC = b"PSSN"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_INTERVAL = 65536
+_HEADER = struct.Struct("<4sHBBd16s")     # magic, version, preemptive, timeline, aging, workload hash
+_PREFIX = struct.Struct("<II")            # payload length, CRC32
+_RECORD = struct.Struct("<dQQQQQQB7x")    # clock, seq, completed, new completions, first segment,
+                                          # segments, ready entries, has running job
+_TOTALS = struct.Struct("<5d")            # waiting, turnaround, response, busy time, last completion
+
+SNAPSHOT_MODES = {"Non-Preemptive": False, "Preemptive": True}
+
+def _column(typecode, data, offset, count):
+    column = array(typecode)
+    column.frombytes(data[offset:offset + 8 * count])
+    return column, offset + 8 * count
+
+def _truncate(schedule, count):
+    if isinstance(schedule, Timeline):
+        del schedule.starts[count:], schedule.ends[count:], schedule.pids[count:]
+    else:
+        del schedule[count:]
+
+def _read_records(f):
+    # Yields (record header, totals, payload) for every intact record and
+    # leaves f just past the last one
+    while True:
+        offset = f.tell()
+        prefix = f.read(_PREFIX.size)
+        if len(prefix) < _PREFIX.size:
+            break
+        length, crc = _PREFIX.unpack(prefix)
+        payload = f.read(length)
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break
+        yield _RECORD.unpack_from(payload), _TOTALS.unpack_from(payload, _RECORD.size), payload
+    f.seek(offset)
+
+def _read_header(f, path):
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError(f"Not a snapshot file: {path}")
+    magic, version, preemptive, timeline, aging, digest = _HEADER.unpack(header)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f"Not a snapshot file: {path}")
+    return preemptive, timeline, aging, digest
+
+class SnapshotLog:
+    # The engine's checkpoint object for one table run (see engines.py)
+    def __init__(self, path, table, preemptive, aging=0.0, schedule=None, interval=SNAPSHOT_INTERVAL):
+        if interval < 1:
+            raise ValueError("Snapshot interval must be at least 1")
+        self.path = path
+        self.table = table
+        self.preemptive = preemptive
+        self.aging = aging
+        self.schedule = schedule
+        self.interval = interval
+        self.state = None
+        self.completed = 0
+        self.totals = [0.0] * 5
+        self.snapshots = 0
+        self.rows = array("q")    # rows completed since the last record, in order
+        self._saved_segments = 0
+        self._file = None
+        self._digest = bytes.fromhex(fingerprint(table))
+        self._pid_rows = None
+        self._label_rows = []
+
+    def open(self):
+        # Restores the table and timeline from an existing file and returns
+        # the Checkpoint to resume from (None to start from scratch)
+        header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, self.preemptive, self.schedule is not None,
+                              self.aging, self._digest)
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < _HEADER.size:
+            self._file = open(self.path, "w+b")
+            self._file.write(header)
+            return None
+        self._file = f = open(self.path, "r+b")
+        if _read_header(f, self.path) != _HEADER.unpack(header)[2:]:
+            f.close()
+            raise ValueError(f"Snapshot {self.path} was taken for a different workload, mode or timeline setting")
+        last = None
+        for record, totals, payload in _read_records(f):
+            self._apply(record, payload)
+            self.totals = list(totals)
+            self.snapshots += 1
+            last = record, payload
+        f.truncate()
+        if last is None:
+            return None
+        record, payload = last
+        clock, seq, completed, new, first, segments, entries, running = record
+        # The running job is stored after the ready queue
+        ready = self._entries(payload, self._state_offset(record), entries + running)
+        current = ready.pop() if running else None
+        emitted = len(self.schedule) if self.schedule is not None else 0
+        self._saved_segments = emitted
+        self.state = Checkpoint(clock, seq, ready, current, self.completed, emitted,
+                                self.schedule[-1]["end"] if emitted else None)
+        return self.state
+
+    def _apply(self, record, payload):
+        table = self.table
+        clock, seq, completed, new, first, segments, entries, running = record
+        offset = _RECORD.size + _TOTALS.size
+        rows, offset = _column("q", payload, offset, new)
+        starts, offset = _column("d", payload, offset, new)
+        completions, offset = _column("d", payload, offset, new)
+        for i, start, completion in zip(rows, starts, completions):
+            table.start_time[i] = start
+            table.completion_time[i] = completion
+            table.turnaround_time[i] = completion - table.arrival_time[i]
+            table.waiting_time[i] = table.turnaround_time[i] - table.burst_time[i]
+        self.completed = completed + new
+        if self.schedule is not None:
+            pids, offset = _column("q", payload, offset, segments)
+            seg_starts, offset = _column("d", payload, offset, segments)
+            seg_ends, offset = _column("d", payload, offset, segments)
+            _truncate(self.schedule, first)
+            emit = segment_writer(self.schedule)
+            for pid, start, end in zip(pids, seg_starts, seg_ends):
+                emit("Idle" if pid < 0 else table.label(pid), start, end)
+
+    def _state_offset(self, record):
+        new, segments = record[3], record[5]
+        return _RECORD.size + _TOTALS.size + 24 * new + (24 * segments if self.schedule is not None else 0)
+
+    def _job(self, row):
+        table = self.table
+        return (table.label(row), table.arrival_time[row], table.burst_time[row], table.priority[row], row)
+
+    def _entries(self, payload, offset, count):
+        # Ready-queue entries in the engine's own layout
+        keys, offset = _column("d", payload, offset, count)
+        seqs, offset = _column("q", payload, offset, count)
+        rows, offset = _column("q", payload, offset, count)
+        remaining, offset = _column("d", payload, offset, count)
+        starts, offset = _column("d", payload, offset, count)
+        entries = []
+        for key, seq, row, left, start in zip(keys, seqs, rows, remaining, starts):
+            job = self._job(row)
+            if self.preemptive:
+                entries.append((key, job[1], seq, job, left, None if start != start else start))
+            else:
+                entries.append((key, job[1], seq, job))
+        return entries
+
+    def restore(self):
+        if self.state is None:
+            return None
+        state = self.state
+        return state.clock, state.cursor, list(state.ready), state.current
+
+    def _pid_row(self, pid):
+        if self._pid_rows is None:
+            # Built backwards so a repeated label maps to its first row
+            rows = range(len(self.table) - 1, -1, -1)
+            self._pid_rows = dict(zip(map(self.table.label, rows), rows))
+            self._pid_rows["Idle"] = -1
+        return self._pid_rows.get(pid, -1)
+
+    def save(self, clock, seq, ready, current):
+        table = self.table
+        entries = list(ready) + ([current] if current is not None else [])
+        rows = self.rows
+        new = len(rows)
+        starts = array("d", map(table.start_time.__getitem__, rows))
+        completions = array("d", map(table.completion_time.__getitem__, rows))
+        arrivals = list(map(table.arrival_time.__getitem__, rows))
+        bursts = list(map(table.burst_time.__getitem__, rows))
+        totals = self.totals
+        turnaround = sum(completions) - sum(arrivals)
+        totals[0] += turnaround - sum(bursts)
+        totals[1] += turnaround
+        totals[2] += sum(starts) - sum(arrivals)
+        totals[3] += sum(bursts)
+        if new:
+            totals[4] = max(totals[4], max(completions))
+        parts = [None, _TOTALS.pack(*totals), rows.tobytes(), starts.tobytes(), completions.tobytes()]
+        first = segments = 0
+        if self.schedule is not None:
+            # The last saved segment may have grown since, so it is rewritten
+            schedule = self.schedule
+            first = max(self._saved_segments - 1, 0)
+            segments = len(schedule) - first
+            if isinstance(schedule, Timeline):
+                label_rows = self._label_rows
+                self._pid_row(None)
+                label_rows.extend(map(self._pid_rows.get, schedule.labels[len(label_rows):], repeat(-1)))
+                parts.append(array("q", map(label_rows.__getitem__, schedule.pids[first:])).tobytes())
+                parts.append(schedule.starts[first:].tobytes())
+                parts.append(schedule.ends[first:].tobytes())
+            else:
+                span = schedule[first:]
+                parts.append(array("q", (self._pid_row(s["pid"]) for s in span)).tobytes())
+                parts.append(array("d", (s["start"] for s in span)).tobytes())
+                parts.append(array("d", (s["end"] for s in span)).tobytes())
+            self._saved_segments = len(schedule)
+        parts[0] = _RECORD.pack(clock, seq, self.completed, new, first, segments, len(ready), current is not None)
+        parts.append(array("d", (e[0] for e in entries)).tobytes())
+        parts.append(array("q", (e[2] for e in entries)).tobytes())
+        parts.append(array("q", (e[3][4] for e in entries)).tobytes())
+        if self.preemptive:
+            parts.append(array("d", (e[4] for e in entries)).tobytes())
+            parts.append(array("d", (float("nan") if e[5] is None else e[5] for e in entries)).tobytes())
+        else:
+            parts.append(array("d", (e[3][2] for e in entries)).tobytes())
+            parts.append(array("d", [float("nan")]) * len(entries))
+        payload = b"".join(parts)
+        self._file.write(_PREFIX.pack(len(payload), zlib.crc32(payload)) + payload)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.completed += new
+        self.snapshots += 1
+        del rows[:]
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+def schedule_table_resumable(table, mode, path, schedule=None, progress=None, aging=0.0,
+                             interval=SNAPSHOT_INTERVAL, keep=False):
+    # schedule_table that snapshots to path and, if path already holds
+    # snapshots of the same run, resumes from the latest one. schedule must
+    # start empty. The file is removed when the run completes unless keep.
+    if mode not in SNAPSHOT_MODES:
+        raise ValueError(f"Snapshots are only supported by the priority modes, not {mode}")
+    log = SnapshotLog(path, table, SNAPSHOT_MODES[mode], aging, schedule, interval)
+    table.reset()
+    try:
+        state = log.open()
+        jobs = table_jobs(table, arrival_order(table), state.cursor if state is not None else 0)
+
+        start_col, completion_col = table.start_time, table.completion_time
+        waiting_col, turnaround_col = table.waiting_time, table.turnaround_time
+        total = len(table)
+        done = log.completed
+        finished = log.rows.append
+        for job, start, completion in SIMULATORS[mode](jobs, schedule, aging, None, log):
+            i = job[4]
+            start_col[i] = start
+            completion_col[i] = completion
+            turnaround = completion - job[1]
+            turnaround_col[i] = turnaround
+            waiting_col[i] = turnaround - job[2]
+            finished(i)
+            done += 1
+            if progress is not None and done % PROGRESS_INTERVAL == 0:
+                progress(done, total)
+        if progress is not None:
+            progress(done, total)
+    finally:
+        log.close()
+    if not keep:
+        os.remove(path)
+    return table
+
+def snapshot_info(path):
+    # Progress of a (possibly still running) resumable run from its file
+    with open(path, "rb") as f:
+        preemptive, timeline, aging, _ = _read_header(f, path)
+        last, count = None, 0
+        for record, totals, _ in _read_records(f):
+            last, count = (record, totals), count + 1
+    info = {"mode": "Preemptive" if preemptive else "Non-Preemptive", "aging": aging, "snapshots": count,
+            "clock": 0.0, "jobs_started": 0, "completed": 0}
+    if last is not None:
+        record, totals = last
+        done = record[2] + record[3]
+        info.update(clock=record[0], jobs_started=record[1], completed=done,
+                    avg_waiting=totals[0] / done if done else 0.0,
+                    avg_turnaround=totals[1] / done if done else 0.0,
+                    avg_response=totals[2] / done if done else 0.0,
+                    busy_time=totals[3], last_completion=totals[4])
+    return info
@@ -0,0 +1,98 @@
+import heapq
+import time
+
+# Opt-in engine instrumentation. Engines take stats=None and, only when a
+# SimulationStats is passed, swap in counting/timing versions of their heap
+# operations and segment writer; both are resolved once per run, so a run
+# without stats executes the same code as before. Context switches and idle
+# time are read off the segments the engine emits (Idle gaps and Overhead
+# segments do not count as a switch), so they are exact even when no timeline
+# is kept.
+
+class SimulationStats:
+    __slots__ = ("iterations", "pushes", "pops", "queue_seconds", "preemptions", "context_switches",
+                 "idle_periods", "idle_time", "overhead_time", "busy_time", "seconds", "_last_pid", "_started")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.iterations = 0
+        self.pushes = 0
+        self.pops = 0
+        self.queue_seconds = 0.0
+        self.preemptions = 0
+        self.context_switches = 0
+        self.idle_periods = 0
+        self.idle_time = 0.0
+        self.overhead_time = 0.0
+        self.busy_time = 0.0
+        self.seconds = 0.0
+        self._last_pid = None
+        self._started = None
+
+    def start(self):
+        self._started = time.perf_counter()
+
+    def finish(self):
+        if self._started is not None:
+            self.seconds += time.perf_counter() - self._started
+            self._started = None
+
+    def heap_ops(self):
+        # (push, pop) drop-ins for heapq.heappush / heapq.heappop
+        perf = time.perf_counter
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        def push(heap, item):
+            started = perf()
+            heappush(heap, item)
+            self.queue_seconds += perf() - started
+            self.pushes += 1
+
+        def pop(heap):
+            started = perf()
+            item = heappop(heap)
+            self.queue_seconds += perf() - started
+            self.pops += 1
+            return item
+        return push, pop
+
+    def writer(self, emit):
+        # Wraps a segment_writer() result
+        def record(pid, start, end):
+            if end > start:
+                if pid == "Idle":
+                    self.idle_periods += 1
+                    self.idle_time += end - start
+                elif pid == "Overhead":
+                    self.overhead_time += end - start
+                else:
+                    if self._last_pid is not None and pid != self._last_pid:
+                        self.context_switches += 1
+                    self._last_pid = pid
+                    self.busy_time += end - start
+            emit(pid, start, end)
+        return record
+
+    def as_dict(self):
+        return {
+            "iterations": self.iterations,
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "queue_seconds": self.queue_seconds,
+            "preemptions": self.preemptions,
+            "context_switches": self.context_switches,
+            "idle_periods": self.idle_periods,
+            "idle_time": self.idle_time,
+            "overhead_time": self.overhead_time,
+            "busy_time": self.busy_time,
+            "seconds": self.seconds,
+        }
+
+    def summary(self):
+        return (f"Loop iterations: {self.iterations} | Queue ops: {self.pushes} push / {self.pops} pop "
+                f"({self.queue_seconds * 1e3:.2f} ms) | Run time: {self.seconds * 1e3:.2f} ms\n"
+                f"Preemptions: {self.preemptions} | Context switches: {self.context_switches} | "
+                f"Idle: {self.idle_time:.2f} over {self.idle_periods} periods | "
+                f"Overhead: {self.overhead_time:.2f}")
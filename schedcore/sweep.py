@@ -0,0 +1,103 @@
+import itertools
+import os
+
+from .cache import ScheduleCache
+from .engines import SIMULATORS
+from .metrics import compute_metrics
+from .policies import Policy
+from .table import ProcessTable, schedule_table
+from .workload import load_table
+
+# Parameter sweeps over workloads x modes x seeds. Every task builds its own
+# ProcessTable inside the worker, so no job state is shared between runs and
+# the grid can be fanned out across a process pool.
+#
+# A workload is one of:
+#   - a path to a CSV/JSONL trace,
+#   - a sequence of (pid, arrival, burst, priority) jobs,
+#   - a picklable callable taking the seed and returning such a sequence.
+#
+# A mode is a SIMULATORS name or a Policy instance; result rows carry a
+# Policy as its repr, e.g. "RoundRobin(time_slice=4.0)".
+
+# One ScheduleCache per cache directory in each worker process
+_caches = {}
+
+SUMMARY_KEYS = ("avg_waiting", "p95_waiting", "p99_waiting", "avg_turnaround",
+                "p95_turnaround", "avg_response", "cpu_utilization", "throughput")
+
+def _build_table(workload, seed):
+    if isinstance(workload, (str, os.PathLike)):
+        return load_table(workload)
+    if callable(workload):
+        workload = workload(seed)
+    if isinstance(workload, ProcessTable):
+        return workload
+    table = ProcessTable(labels=[])
+    for pid, arrival, burst, priority in workload:
+        table.append(pid, arrival, burst, priority)
+    return table
+
+def run_task(task):
+    # task is (workload name, workload, mode, seed[, cache directory]);
+    # returns a flat result row
+    name, workload, mode, seed = task[:4]
+    cache_dir = task[4] if len(task) > 4 else None
+    table = _build_table(workload, seed)
+    if cache_dir is None:
+        schedule_table(table, mode)
+    else:
+        if cache_dir not in _caches:
+            _caches[cache_dir] = ScheduleCache(directory=cache_dir)
+        _caches[cache_dir].schedule_table(table, mode)
+    report = compute_metrics(table, by_priority=False)
+    return {
+        "workload": name,
+        "mode": mode if isinstance(mode, str) else repr(mode),
+        "seed": seed,
+        "count": report.count,
+        "avg_waiting": report.avg_waiting,
+        "p95_waiting": report.waiting["p95"],
+        "p99_waiting": report.waiting["p99"],
+        "avg_turnaround": report.avg_turnaround,
+        "p95_turnaround": report.turnaround["p95"],
+        "avg_response": report.response["mean"],
+        "cpu_utilization": report.cpu_utilization,
+        "throughput": report.throughput,
+        "makespan": report.makespan,
+    }
+
+def sweep_tasks(workloads, modes=None, seeds=(None,), cache_dir=None):
+    modes = list(SIMULATORS) if modes is None else list(modes)
+    for mode in modes:
+        if not isinstance(mode, Policy) and mode not in SIMULATORS:
+            raise ValueError(f"Unknown scheduling mode: {mode}")
+    return [(name, workload, mode, seed, cache_dir)
+            for (name, workload), mode, seed in itertools.product(workloads.items(), modes, seeds)]
+
+def run_sweep(workloads, modes=None, seeds=(None,), max_workers=None, chunksize=1, cache_dir=None):
+    # workloads maps a name to a workload. Results come back in grid order.
+    # max_workers=0 runs every task in the calling process. With cache_dir,
+    # workers share an on-disk ScheduleCache, so repeated workloads are only
+    # simulated once.
+    tasks = sweep_tasks(workloads, modes, seeds, cache_dir)
+    if max_workers == 0 or len(tasks) <= 1:
+        return [run_task(task) for task in tasks]
+    # Imported here: concurrent.futures would add tens of milliseconds to
+    # importing schedcore
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(run_task, tasks, chunksize=chunksize))
+
+def summarize(results):
+    # Averages each metric over seeds for every (workload, mode) pair
+    groups = {}
+    for row in results:
+        groups.setdefault((row["workload"], row["mode"]), []).append(row)
+    summary = []
+    for (name, mode), rows in groups.items():
+        entry = {"workload": name, "mode": mode, "runs": len(rows)}
+        for key in SUMMARY_KEYS:
+            entry[key] = sum(row[key] for row in rows) / len(rows)
+        summary.append(entry)
+    return summary
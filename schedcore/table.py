@@ -0,0 +1,234 @@
+import heapq
+from array import array
+from itertools import islice
+
+from .engines import simulator_for
+
+# schedule_table reports progress every PROGRESS_INTERVAL completed jobs
+PROGRESS_INTERVAL = 1024
+ORDER_BLOCK = 65536
+
+# Struct-of-arrays process table: one typed array per field instead of one
+# Python object per job. Six float64 columns and an int32 priority come to 52
+# bytes per job. Remaining time is not stored: a row's job has its full burst
+# left until it is scheduled and none after. Integer PIDs go in a uint32 pid
+# column (56 bytes per job in all); tables built with labels instead keep each
+# PID as a string in a packed Labels column, 4 bytes per job plus its UTF-8
+# text, and leave pid empty.
+
+FLOAT_COLUMNS = ("arrival_time", "burst_time", "start_time", "completion_time", "waiting_time", "turnaround_time")
+
+class Labels:
+    # Strings packed into one UTF-8 buffer plus end offsets, as export.py
+    # stores str columns, instead of one Python str object per row. Offsets
+    # are uint32 until the text passes 4 GiB.
+    __slots__ = ("data", "ends")
+
+    def __init__(self, values=()):
+        self.data = bytearray()
+        self.ends = array("I")
+        for value in values:
+            self.append(value)
+
+    def __len__(self):
+        return len(self.ends)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.ends)
+        if not 0 <= index < len(self.ends):
+            raise IndexError("Labels index out of range")
+        start = self.ends[index - 1] if index else 0
+        return self.data[start:self.ends[index]].decode("utf-8")
+
+    def __iter__(self):
+        for index in range(len(self.ends)):
+            yield self[index]
+
+    def append(self, value):
+        self.data += str(value).encode("utf-8")
+        if len(self.data) > 0xFFFFFFFF and self.ends.typecode == "I":
+            self.ends = array("q", self.ends)
+        self.ends.append(len(self.data))
+
+    def nbytes(self):
+        return len(self.data) + self.ends.itemsize * len(self.ends)
+
+class ProcessTable:
+    def __init__(self, labels=None):
+        # labels: None for integer PIDs, else the initial PID strings (usually
+        # none, e.g. ProcessTable([]))
+        self.pid = array("I")
+        self.priority = array("i")
+        for name in FLOAT_COLUMNS:
+            setattr(self, name, array("d"))
+        self.labels = Labels(labels) if labels is not None else None
+
+    def __len__(self):
+        return len(self.arrival_time)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ProcessTable index out of range")
+        return ProcessView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ProcessView(self, index)
+
+    def nbytes(self):
+        columns = [self.pid, self.priority] + [getattr(self, name) for name in FLOAT_COLUMNS]
+        total = sum(column.itemsize * len(column) for column in columns)
+        return total + (self.labels.nbytes() if self.labels is not None else 0)
+
+    def append(self, pid, arrival_time, burst_time, priority):
+        if self.labels is not None:
+            self.labels.append(pid)
+        else:
+            self.pid.append(pid)
+        self.priority.append(priority)
+        self.arrival_time.append(arrival_time)
+        self.burst_time.append(burst_time)
+        for name in ("start_time", "completion_time"):
+            getattr(self, name).append(float("nan"))
+        self.waiting_time.append(0.0)
+        self.turnaround_time.append(0.0)
+
+    def label(self, index):
+        return self.labels[index] if self.labels is not None else self.pid[index]
+
+    def reset(self):
+        n = len(self)
+        self.start_time = array("d", [float("nan")]) * n
+        self.completion_time = array("d", [float("nan")]) * n
+        self.waiting_time = array("d", bytes(8 * n))
+        self.turnaround_time = array("d", bytes(8 * n))
+
+    @classmethod
+    def from_columns(cls, arrival_time, burst_time, priority, pid=None, labels=None):
+        # PIDs are pid (default 0..n-1) or, if given, the strings in labels
+        table = cls(labels)
+        n = len(arrival_time)
+        if labels is None:
+            table.pid = array("I", pid if pid is not None else range(n))
+        table.priority = array("i", priority)
+        table.arrival_time = array("d", arrival_time)
+        table.burst_time = array("d", burst_time)
+        ids = table.pid if labels is None else table.labels
+        if not len(ids) == len(table.priority) == len(table.burst_time) == n:
+            raise ValueError("All columns must have the same length")
+        table.reset()
+        return table
+
+    @classmethod
+    def from_processes(cls, processes):
+        table = cls(labels=[])
+        for p in processes:
+            table.append(p.pid, p.arrival_time, p.burst_time, p.priority)
+        return table
+
+def schedule_table(table, mode, schedule=None, progress=None, aging=0.0, stats=None):
+    # Runs an engine directly against the columns and fills in the result
+    # columns in place; row order is left unchanged. progress(done, total) is
+    # called every PROGRESS_INTERVAL completions and once at the end; it may
+    # raise (e.g. ScheduleCancelled) to abandon the run.
+    simulator = simulator_for(mode)
+    return run_table(table, lambda jobs: simulator(jobs, schedule, aging, stats), progress)
+
+def arrival_order(table):
+    # Row numbers in arrival order, ties in row order. Rows already in order
+    # give a range. Otherwise each block of ORDER_BLOCK rows is argsorted into
+    # a 4-byte-per-row array and the blocks are merged lazily, so only one
+    # block's worth of Python ints and keys exists at a time.
+    arrival = table.arrival_time
+    n = len(table)
+    if all(a <= b for a, b in zip(arrival, islice(arrival, 1, None))):
+        return range(n)
+    key = arrival.__getitem__
+    blocks = [array("I", sorted(range(lo, min(lo + ORDER_BLOCK, n)), key=key)) for lo in range(0, n, ORDER_BLOCK)]
+    return heapq.merge(*blocks, key=key)
+
+def table_jobs(table, order, skip=0):
+    # The engine's job tuples, built one at a time from rows order[skip:]
+    arrival, burst, priority, label = table.arrival_time, table.burst_time, table.priority, table.label
+    return ((label(i), arrival[i], burst[i], priority[i], i) for i in islice(order, skip, None))
+
+def run_table(table, simulate, progress=None):
+    # schedule_table for any engine: simulate(jobs) takes the table's jobs in
+    # arrival order and yields (job, start, completion)
+    table.reset()
+    jobs = table_jobs(table, arrival_order(table))
+
+    start_col, completion_col = table.start_time, table.completion_time
+    waiting_col, turnaround_col = table.waiting_time, table.turnaround_time
+    total = len(table)
+    done = 0
+    for job, start, completion in simulate(jobs):
+        i = job[4]
+        start_col[i] = start
+        completion_col[i] = completion
+        turnaround = completion - job[1]
+        turnaround_col[i] = turnaround
+        waiting_col[i] = turnaround - job[2]
+        done += 1
+        if progress is not None and done % PROGRESS_INTERVAL == 0:
+            progress(done, total)
+    if progress is not None:
+        progress(done, total)
+    return table
+
+def apply_results(table, processes):
+    # Copies a scheduled table built by ProcessTable.from_processes(processes)
+    # back onto those Process objects and returns them in completion order,
+    # the same order run_schedule leaves them in
+    for i, p in enumerate(processes):
+        p.remaining_time = 0 if table.completion_time[i] == table.completion_time[i] else p.burst_time
+        p.start_time = table.start_time[i]
+        p.completion_time = table.completion_time[i]
+        p.waiting_time = table.waiting_time[i]
+        p.turnaround_time = table.turnaround_time[i]
+    return sorted(processes, key=lambda p: p.completion_time)
+
+class ProcessView:
+    # Lightweight row view with the same attribute names as Process
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def _column(name, optional=False):
+        def getter(self):
+            value = getattr(self.table, name)[self.index]
+            if optional and value != value:  # NaN marks "not scheduled yet"
+                return None
+            return value
+
+        def setter(self, value):
+            if optional and value is None:
+                value = float("nan")
+            getattr(self.table, name)[self.index] = value
+
+        return property(getter, setter)
+
+    arrival_time = _column("arrival_time")
+    burst_time = _column("burst_time")
+    priority = _column("priority")
+    waiting_time = _column("waiting_time")
+    turnaround_time = _column("turnaround_time")
+    start_time = _column("start_time", optional=True)
+    completion_time = _column("completion_time", optional=True)
+    del _column
+
+    @property
+    def remaining_time(self):
+        return self.burst_time if self.completion_time is None else 0.0
+
+    @property
+    def pid(self):
+        return self.table.label(self.index)
+
+    def __repr__(self):
+        return f"ProcessView(pid={self.pid!r}, index={self.index})"
@@ -0,0 +1,233 @@
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from math import ceil, floor, log10
+
+def add_segment(schedule, pid, start, end):
+    # Extend the last Gantt segment when the same process keeps the CPU
+    if schedule is None or end <= start:
+        return
+    if schedule and schedule[-1]["pid"] == pid and schedule[-1]["end"] == start:
+        schedule[-1]["end"] = end
+    else:
+        schedule.append({"pid": pid, "start": start, "end": end})
+
+def _discard(pid, start, end):
+    pass
+
+def segment_writer(schedule):
+    # Resolves once per run how an engine records a segment: into a list of
+    # {"pid", "start", "end"} dicts, a Timeline or other sink with
+    # add(pid, start, end) (such as export.TimelineExport), or nowhere
+    if schedule is None:
+        return _discard
+    if isinstance(schedule, list):
+        return lambda pid, start, end: add_segment(schedule, pid, start, end)
+    return schedule.add
+
+# Binary timeline file: header, PID labels as a JSON list, then the start, end
+# and PID-index columns, each 8-byte aligned so they can be memory-mapped.
+TIMELINE_MAGIC = b"PSTL"
+TIMELINE_VERSION = 1
+_HEADER = struct.Struct("<4sHBxQQ")
+
+def _padding(offset):
+    return -offset % 8
+
+class Timeline:
+    # Run-length Gantt timeline as parallel columns: start and end times
+    # (float64) and an index (uint32) into an interned table of PID labels.
+    # Consecutive segments of the same PID are merged as they are added.
+    def __init__(self, labels=None):
+        self.starts = array("d")
+        self.ends = array("d")
+        self.pids = array("I")
+        self.labels = list(labels) if labels is not None else []
+        self._index = {label: i for i, label in enumerate(self.labels)}
+        self._mmap = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        labels = self.labels
+        for start, end, pid in zip(self.starts, self.ends, self.pids):
+            yield {"pid": labels[pid], "start": start, "end": end}
+
+    def __getitem__(self, index):
+        return {"pid": self.labels[self.pids[index]], "start": self.starts[index], "end": self.ends[index]}
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in (self.starts, self.ends, self.pids))
+
+    @property
+    def end(self):
+        return self.ends[-1] if len(self.ends) else 0.0
+
+    def intern(self, pid):
+        index = self._index.get(pid)
+        if index is None:
+            index = self._index[pid] = len(self.labels)
+            self.labels.append(pid)
+        return index
+
+    def add(self, pid, start, end):
+        if end <= start:
+            return
+        index = self._index.get(pid)
+        if index is None:
+            index = self.intern(pid)
+        ends = self.ends
+        if ends and ends[-1] == start and self.pids[-1] == index:
+            ends[-1] = end
+        else:
+            self.starts.append(start)
+            ends.append(end)
+            self.pids.append(index)
+
+    def pid_at(self, index):
+        return self.labels[self.pids[index]]
+
+    def window(self, t0, t1):
+        # Indices of segments overlapping [t0, t1)
+        return range(bisect_right(self.ends, t0), bisect_left(self.starts, t1))
+
+    def slice(self, t0, t1):
+        # New in-memory Timeline holding the segments that overlap [t0, t1);
+        # on a mapped file only that range is read
+        rows = self.window(t0, t1)
+        part = Timeline(self.labels)
+        part.starts = array("d", self.starts[rows.start:rows.stop])
+        part.ends = array("d", self.ends[rows.start:rows.stop])
+        part.pids = array("I", self.pids[rows.start:rows.stop])
+        return part
+
+    def to_dicts(self):
+        return list(self)
+
+    @classmethod
+    def from_segments(cls, schedule):
+        timeline = cls()
+        for segment in schedule:
+            timeline.add(segment["pid"], segment["start"], segment["end"])
+        return timeline
+
+    def save(self, path):
+        import json   # json and re cost more to import than the rest of schedcore
+        labels = json.dumps(self.labels).encode("utf-8")
+        byteorder = 0 if sys.byteorder == "little" else 1
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(TIMELINE_MAGIC, TIMELINE_VERSION, byteorder, len(self), len(labels)))
+            f.write(labels)
+            f.write(bytes(_padding(_HEADER.size + len(labels))))
+            for column in (self.starts, self.ends, self.pids):
+                f.write(column.tobytes())
+                f.write(bytes(_padding(column.itemsize * len(column))))
+
+    @classmethod
+    def load(cls, path, use_mmap=True):
+        # With use_mmap the columns are read-only views over the mapped file,
+        # so opening a large timeline costs almost nothing until it is sliced
+        import json
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"Not a timeline file: {path}")
+            magic, version, byteorder, count, labels_size = _HEADER.unpack(header)
+            if magic != TIMELINE_MAGIC or version != TIMELINE_VERSION:
+                raise ValueError(f"Not a timeline file: {path}")
+            if byteorder != (0 if sys.byteorder == "little" else 1):
+                raise ValueError("Timeline file was written with a different byte order")
+            timeline = cls(json.loads(f.read(labels_size).decode("utf-8")))
+            offset = _HEADER.size + labels_size + _padding(_HEADER.size + labels_size)
+            if use_mmap and count:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                timeline._mmap = data
+                view = memoryview(data)
+            else:
+                f.seek(0)
+                view = memoryview(f.read())
+        columns = []
+        for typecode in ("d", "d", "I"):
+            size = array(typecode).itemsize * count
+            columns.append(view[offset:offset + size].cast(typecode))
+            offset += size + _padding(size)
+        if not use_mmap or not count:
+            columns = [array(typecode, column) for typecode, column in zip("ddI", columns)]
+        timeline.starts, timeline.ends, timeline.pids = columns
+        return timeline
+
+    def close(self):
+        # Releases a memory-mapped file; the timeline is unusable afterwards
+        if self._mmap is not None:
+            for column in (self.starts, self.ends, self.pids):
+                column.release()
+            self._mmap.close()
+            self._mmap = None
+
+class TimelineIndex:
+    # Sorted start/end arrays over a finished schedule, so a viewport can find
+    # its segments by bisection instead of walking the whole timeline
+    def __init__(self, schedule):
+        self.schedule = schedule
+        if isinstance(schedule, Timeline):
+            self.starts, self.ends = schedule.starts, schedule.ends
+            self.pid_at = schedule.pid_at
+        else:
+            self.starts = [segment["start"] for segment in schedule]
+            self.ends = [segment["end"] for segment in schedule]
+
+    def pid_at(self, index):
+        return self.schedule[index]["pid"]
+
+    @property
+    def start(self):
+        return self.starts[0] if len(self.starts) else 0.0
+
+    @property
+    def end(self):
+        return self.ends[-1] if len(self.ends) else 0.0
+
+    def window(self, t0, t1):
+        # Indices of segments overlapping [t0, t1)
+        return range(bisect_right(self.ends, t0), bisect_left(self.starts, t1))
+
+    def bars(self, t0, t1, min_span):
+        # Yields (start, end, pid) for the view [t0, t1). Runs of segments
+        # narrower than min_span (one pixel, say) are merged into a single bar
+        # with pid None, so the output size is bounded by the view width in
+        # pixels rather than by the number of segments.
+        starts, ends, pid_at = self.starts, self.ends, self.pid_at
+        visible = self.window(t0, t1)
+        i, hi = visible.start, visible.stop
+        while i < hi:
+            if ends[i] - starts[i] >= min_span:
+                yield starts[i], ends[i], pid_at(i)
+                i += 1
+                continue
+            j = max(bisect_left(starts, starts[i] + min_span, i, hi), i + 1)
+            # Segments start in order without overlapping, so only the last
+            # one in the run can reach past the pixel; a wide one keeps its
+            # own bar
+            if j - 1 > i and ends[j - 1] - starts[j - 1] >= min_span:
+                j -= 1
+            yield starts[i], ends[j - 1], pid_at(i) if j == i + 1 else None
+            i = j
+
+def tick_step(span, pixels, min_pixels=50):
+    # Smallest 1/2/5 x 10^k step that keeps tick labels min_pixels apart
+    if span <= 0 or pixels <= 0:
+        return 1.0
+    raw = span * min_pixels / pixels
+    magnitude = 10 ** floor(log10(raw))
+    for factor in (1, 2, 5, 10):
+        if factor * magnitude >= raw:
+            return factor * magnitude
+    return 10 * magnitude
+
+def ticks(t0, t1, step):
+    first = ceil(t0 / step)
+    last = floor(t1 / step)
+    return [k * step for k in range(first, last + 1)]
@@ -0,0 +1,133 @@
+import heapq
+import math
+import os
+
+from .table import ProcessTable
+
+# Streaming trace loaders. Each yields (pid, arrival, burst, priority) tuples,
+# the job shape the engines consume, one line at a time, so a trace is never
+# held in memory as a whole. Traces must be sorted by arrival; a small
+# reorder_window lets slightly out-of-order traces through by buffering that
+# many jobs in a heap.
+
+FIELDS = {
+    "pid": ("pid", "process_id", "id"),
+    "arrival": ("arrival", "arrival_time"),
+    "burst": ("burst", "burst_time"),
+    "priority": ("priority",),
+}
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+def _lookup(record, field):
+    for key in FIELDS[field]:
+        if key in record and record[key] not in (None, ""):
+            return record[key]
+    return None
+
+def parse_job(record, line=None):
+    # Turns a CSV row or JSON object into a job tuple, applying the same
+    # checks as the interactive front-ends
+    where = f" on line {line}" if line is not None else ""
+    arrival, burst, priority = (_lookup(record, f) for f in ("arrival", "burst", "priority"))
+    if arrival is None or burst is None or priority is None:
+        raise ValueError(f"Missing arrival, burst or priority{where}")
+    try:
+        arrival = float(arrival)
+        burst = float(burst)
+        priority = int(priority)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"Invalid numeric value{where}") from None
+    # NaN slips past every range check below and stalls the engines
+    if not (math.isfinite(arrival) and math.isfinite(burst)):
+        raise ValueError(f"Arrival and burst times must be finite{where}")
+    if arrival < 0:
+        raise ValueError(f"Arrival time must be non-negative{where}")
+    if burst <= 0:
+        raise ValueError(f"Burst time must be positive{where}")
+    if priority < 0:
+        raise ValueError(f"Priority must be non-negative{where}")
+    pid = _lookup(record, "pid")
+    if pid is None:
+        pid = str(line) if line is not None else None
+    return (str(pid), arrival, burst, priority)
+
+def _csv_records(f):
+    # csv and json are imported on use; both pull in re
+    import csv
+    reader = csv.DictReader(f)
+    for row in reader:
+        yield reader.line_num, {k.strip().lower(): (v.strip() if isinstance(v, str) else v)
+                                for k, v in row.items() if k is not None}
+
+def _jsonl_records(f):
+    import json
+    for line_num, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            raise ValueError(f"Invalid JSON on line {line_num}") from None
+        if not isinstance(record, dict):
+            raise ValueError(f"Expected a JSON object on line {line_num}")
+        yield line_num, record
+
+def _in_arrival_order(jobs, reorder_window):
+    if reorder_window <= 0:
+        yield from jobs
+        return
+    buffer = []
+    seq = 0
+    last_arrival = 0.0
+    for job in jobs:
+        heapq.heappush(buffer, (job[1], seq, job))
+        seq += 1
+        if len(buffer) > reorder_window:
+            job = heapq.heappop(buffer)[2]
+            if job[1] < last_arrival:
+                raise ValueError("Trace is out of order by more than the reorder window")
+            last_arrival = job[1]
+            yield job
+    while buffer:
+        job = heapq.heappop(buffer)[2]
+        if job[1] < last_arrival:
+            raise ValueError("Trace is out of order by more than the reorder window")
+        last_arrival = job[1]
+        yield job
+
+def iter_jobs(f, format, reorder_window=0):
+    # Reads jobs from an open text file in "csv" or "jsonl" format
+    if format == "csv":
+        records = _csv_records(f)
+    elif format == "jsonl":
+        records = _jsonl_records(f)
+    else:
+        raise ValueError(f"Unknown trace format: {format}")
+    jobs = (parse_job(record, line_num) for line_num, record in records)
+    return _in_arrival_order(jobs, reorder_window)
+
+def trace_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Cannot tell trace format from file name: {path}")
+    return FORMATS[ext]
+
+def read_trace(path, format=None, reorder_window=0):
+    # Lazily yields jobs from a trace file; the file stays open until the
+    # generator is exhausted or closed
+    format = format or trace_format(path)
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from iter_jobs(f, format, reorder_window)
+
+def load_table(path, format=None, reorder_window=0):
+    # Reads a whole trace into a columnar ProcessTable
+    table = ProcessTable(labels=[])
+    for pid, arrival, burst, priority in read_trace(path, format, reorder_window):
+        table.append(pid, arrival, burst, priority)
+    return table
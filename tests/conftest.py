@@ -0,0 +1,23 @@
+import pytest
+
+from schedcore import ProcessTable
+
+@pytest.fixture
+def jobs():
+    # Small workload with an integer PID, a preemption and an idle gap (A 0-4,
+    # B 4-7, C 7-8, then 7 at 9-11 without preemption)
+    return [("A", 0, 4, 1), ("B", 1, 3, 0), ("C", 2, 1, 1), (7, 9, 2, 2)]
+
+@pytest.fixture
+def many_jobs():
+    return [(f"P{i}", float(i // 3), float(1 + i % 4), i % 5) for i in range(200)]
+
+@pytest.fixture
+def make_table():
+    # Builds a fresh ProcessTable from job tuples, row by row
+    def make(jobs):
+        table = ProcessTable([])
+        for job in jobs:
+            table.append(*job)
+        return table
+    return make
@@ -0,0 +1,34 @@
+import os
+import pickle
+
+from schedcore import ScheduleCache, Timeline, schedule_table
+
+def _entry_paths(directory):
+    return [os.path.join(directory, name) for name in os.listdir(directory)]
+
+def test_disk_tier_round_trip(tmp_path, jobs, make_table):
+    directory = str(tmp_path)
+    timeline = []
+    expected = schedule_table(make_table(jobs), "Preemptive", timeline)
+    ScheduleCache(directory=directory).schedule_table(make_table(jobs), "Preemptive")
+    cache = ScheduleCache(directory=directory)
+    restored = Timeline()
+    table = cache.schedule_table(make_table(jobs), "Preemptive", restored)
+    assert cache.stats()["disk_hits"] == 1
+    assert list(table.completion_time) == list(expected.completion_time)
+    assert [(restored.labels[p], s, e) for p, s, e in zip(restored.pids, restored.starts, restored.ends)] == \
+        [(s["pid"], s["start"], s["end"]) for s in timeline]
+
+def test_bad_disk_entries_are_misses(tmp_path, jobs, make_table):
+    directory = str(tmp_path)
+    ScheduleCache(directory=directory).schedule_table(make_table(jobs), "Preemptive")
+    path, = _entry_paths(directory)
+    with open(path, "rb") as f:
+        good = f.read()
+    payload = pickle.dumps((None, None))
+    for data in (b"", good[:-4], good + b"\0", good[:30] + b"\xff" * 8 + good[38:], payload):
+        with open(path, "wb") as f:
+            f.write(data)
+        cache = ScheduleCache(directory=directory)
+        cache.schedule_table(make_table(jobs), "Preemptive")
+        assert cache.stats()["misses"] == 1
@@ -0,0 +1,111 @@
+import heapq
+import random
+
+from schedcore import Process, SimulationStats, run_schedule, simulate_non_preemptive, simulate_preemptive
+
+def _run(simulator, jobs, **kwargs):
+    schedule = []
+    results = {job[0]: (start, end) for job, start, end in simulator(jobs, schedule, **kwargs)}
+    return results, [(s["pid"], s["start"], s["end"]) for s in schedule]
+
+def test_aging_preempts_at_crossover():
+    # B's effective priority 50 - (t - 1) drops below A's 0 after t = 51;
+    # the swap waits for the half-slice hysteresis margin
+    stats = SimulationStats()
+    results, schedule = _run(simulate_preemptive, [("A", 0, 100, 0), ("B", 1, 1, 50)], aging=1.0, stats=stats)
+    assert results == {"A": (0, 101), "B": (51.5, 52.5)}
+    assert schedule == [("A", 0, 51.5), ("B", 51.5, 52.5), ("A", 52.5, 101)]
+    assert stats.preemptions == 1
+
+def test_jobs_aged_level_take_turns():
+    # Once A has aged level with B they alternate every aging slice instead
+    # of A holding the CPU for its whole burst
+    results, schedule = _run(simulate_preemptive, [("B", 0, 100, 0), ("A", 0, 100, 10)], aging=1.0)
+    assert results == {"B": (0, 190), "A": (10.5, 200)}
+    assert schedule[:3] == [("B", 0, 10.5), ("A", 10.5, 11.5), ("B", 11.5, 12.5)]
+    assert max(end - start for pid, start, end in schedule[1:-1]) == 1.0
+    results, schedule = _run(simulate_preemptive, [("B", 0, 100, 0), ("A", 0, 100, 10)], aging=1.0, aging_slice=4.0)
+    assert schedule[1:3] == [("A", 12, 16), ("B", 16, 20)]
+
+def test_crossover_at_an_arrival():
+    # C arrives at t=4 level with A and B. A is one margin past B at t=4.5
+    # and B takes over; B is one margin past C at t=5 and C takes over
+    results, _ = _run(simulate_preemptive, [("A", 0, 10, 0), ("B", 0, 5, 4), ("C", 4, 1, 0)], aging=1.0)
+    assert results == {"A": (0, 16), "B": (4.5, 15), "C": (5, 6)}
+
+def test_without_aging_priority_order_is_unchanged():
+    jobs = [("A", 0, 4, 2), ("B", 1, 2, 2), ("C", 2, 1, 1), ("D", 2, 3, 2)]
+    assert _run(simulate_preemptive, jobs)[0] == {"A": (0, 5), "B": (5, 7), "C": (2, 3), "D": (7, 10)}
+    assert _run(simulate_non_preemptive, jobs)[0] == {"A": (0, 4), "B": (5, 7), "C": (4, 5), "D": (7, 10)}
+
+def _tick_preemptive(processes):
+    # The original engine: one loop iteration per time unit
+    current_time = 0.0
+    completed = []
+    ready_queue = []
+    current_process = None
+    remaining_processes = processes.copy()
+    while len(completed) < len(processes):
+        for proc in remaining_processes[:]:
+            if proc.arrival_time <= current_time:
+                heapq.heappush(ready_queue, proc)
+                remaining_processes.remove(proc)
+        if current_process and current_process.remaining_time > 0:
+            heapq.heappush(ready_queue, current_process)
+        if ready_queue:
+            next_process = heapq.heappop(ready_queue)
+            if next_process.start_time is None:
+                next_process.start_time = current_time
+            next_process.remaining_time -= 1
+            if next_process.remaining_time == 0:
+                next_process.completion_time = current_time + 1.0
+                next_process.turnaround_time = next_process.completion_time - next_process.arrival_time
+                next_process.waiting_time = next_process.turnaround_time - next_process.burst_time
+                completed.append(next_process)
+                current_process = None
+            else:
+                current_process = next_process
+        else:
+            current_process = None
+        current_time += 1.0
+
+def _tick_non_preemptive(processes):
+    # The original non-preemptive loop
+    current_time = 0.0
+    remaining_processes = processes.copy()
+    while remaining_processes:
+        available = [p for p in remaining_processes if p.arrival_time <= current_time]
+        if not available:
+            current_time = min(p.arrival_time for p in remaining_processes)
+            continue
+        current_process = min(available, key=lambda x: x.priority)
+        current_process.waiting_time = current_time - current_process.arrival_time
+        current_process.turnaround_time = current_process.waiting_time + current_process.burst_time
+        current_time += current_process.burst_time
+        current_process.completion_time = current_time
+        remaining_processes.remove(current_process)
+
+def _fields(processes, with_start):
+    return {p.pid: (p.start_time if with_start else None, p.completion_time, p.waiting_time, p.turnaround_time)
+            for p in processes}
+
+def test_engines_match_the_original_tick_loops():
+    # Integer times and distinct priorities, so the tick loops are exact
+    # and no tie-breaking rule is involved
+    rng = random.Random(2024)
+    for _ in range(600):
+        n = rng.randrange(1, 9)
+        jobs = [(f"P{i}", float(rng.randrange(0, 20)), float(rng.randrange(1, 8)), priority)
+                for i, priority in enumerate(rng.sample(range(50), n))]
+        for mode, reference, with_start in (("Preemptive", _tick_preemptive, True),
+                                            ("Non-Preemptive", _tick_non_preemptive, False)):
+            expected = [Process(*job) for job in jobs]
+            reference(expected)
+            actual = run_schedule([Process(*job) for job in jobs], mode)
+            assert _fields(actual, with_start) == _fields(expected, with_start), (mode, jobs)
+
+def test_fractional_bursts_are_exact():
+    # The tick loop never brought a 2.5 burst to exactly 0
+    results, schedule = _run(simulate_preemptive, [("A", 0, 2.5, 1), ("B", 1, 1.5, 0), ("C", 1.25, 0.25, 2)])
+    assert results == {"A": (0, 4), "B": (1, 2.5), "C": (4, 4.25)}
+    assert schedule == [("A", 0, 1), ("B", 1, 2.5), ("A", 2.5, 4), ("C", 4, 4.25)]
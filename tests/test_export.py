@@ -0,0 +1,42 @@
+import math
+import os
+
+import pytest
+
+from schedcore import (Timeline, compute_metrics, export_schedule, iter_export, read_export,
+                       read_job_results, read_timeline_export, schedule_table)
+
+@pytest.mark.parametrize("ext", ["pscf", "csv"])
+def test_export_round_trip(tmp_path, ext, many_jobs, make_table):
+    jobs_path, timeline_path = str(tmp_path / f"jobs.{ext}"), str(tmp_path / f"timeline.{ext}")
+    table = export_schedule(make_table(many_jobs), "Preemptive", jobs_path, timeline_path, chunk_rows=16)
+    expected = Timeline()
+    reference = schedule_table(make_table(many_jobs), "Preemptive", expected)
+    exported = read_job_results(jobs_path)
+    completions = {reference.label(i): reference.completion_time[i] for i in range(len(reference))}
+    assert dict(zip(exported.labels, exported.completion_time)) == completions
+    assert math.isclose(compute_metrics(exported).avg_waiting, compute_metrics(table).avg_waiting)
+    timeline = read_timeline_export(timeline_path)
+    assert list(timeline.starts) == list(expected.starts)
+    assert [timeline.labels[i] for i in timeline.pids] == [expected.labels[i] for i in expected.pids]
+    assert sum(len(chunk["pid"]) for chunk in iter_export(jobs_path, chunk_rows=16)) == len(many_jobs)
+
+def test_columnar_reader_can_stop_early(tmp_path, many_jobs):
+    path = str(tmp_path / "jobs.pscf")
+    export_schedule(iter(many_jobs), "Non-Preemptive", path, chunk_rows=10)
+    chunks = iter_export(path)
+    assert len(next(chunks)["pid"]) == 10
+    chunks.close()
+    os.remove(path)
+
+def test_truncated_columnar_file_is_refused(tmp_path, many_jobs):
+    path = str(tmp_path / "jobs.pscf")
+    export_schedule(iter(many_jobs), "Non-Preemptive", path, chunk_rows=50)
+    with open(path, "r+b") as f:
+        f.truncate(os.path.getsize(path) - 8)
+    with pytest.raises(ValueError, match="truncated"):
+        read_export(path)
+    with open(path, "wb") as f:
+        f.write(b"PS")
+    with pytest.raises(ValueError, match="Not an export file"):
+        read_export(path)
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from schedcore import SIMULATORS, IncrementalScheduler, SimulationStats
+
+def _workload(seed, n=300):
+    rng = random.Random(seed)
+    # Coarse arrivals and priorities so ties are common
+    return [(f"P{i}", float(rng.randrange(0, 400)), float(rng.randrange(1, 6)), rng.randrange(0, 5))
+            for i in range(n)]
+
+def _scratch(mode, jobs, aging):
+    ordered = sorted(enumerate(jobs), key=lambda item: (item[1][1], item[0]))
+    schedule = []
+    results = [(job[0], start, end) for job, start, end in SIMULATORS[mode]([job for _, job in ordered], schedule, aging)]
+    return results, schedule
+
+@pytest.mark.parametrize("mode, aging", [("Non-Preemptive", 0.0), ("Non-Preemptive", 0.25), ("Preemptive", 0.0),
+                                         ("Preemptive", 0.25), ("Round Robin", 0.0)])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_incremental_matches_full_run(mode, aging, seed):
+    jobs = _workload(seed)
+    scheduler = IncrementalScheduler(mode, checkpoint_interval=7, aging=aging)
+    rng = random.Random(seed)
+    added = 0
+    while added < len(jobs):
+        batch = rng.randrange(1, 40)
+        for job in jobs[added:added + batch]:
+            scheduler.add_job(*job)
+        added += batch
+        results = [(job[0], start, end) for job, start, end in scheduler.run()]
+        expected, schedule = _scratch(mode, jobs[:added], aging)
+        assert results == expected
+        assert scheduler.schedule == schedule
+
+def test_incremental_stats_and_progress():
+    scheduler = IncrementalScheduler("Preemptive", checkpoint_interval=5)
+    for job in _workload(4, 50):
+        scheduler.add_job(*job)
+    calls = []
+    stats = SimulationStats()
+    scheduler.run(lambda done, total: calls.append((done, total)), stats)
+    assert calls[-1] == (50, 50)
+    assert stats.iterations > 0
+    assert len(scheduler.checkpoints) > 1
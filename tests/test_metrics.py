@@ -0,0 +1,25 @@
+import math
+
+from schedcore import Process, ProcessTable, compute_metrics, run_schedule, schedule_table
+
+def test_table_and_process_list_agree(jobs):
+    table = schedule_table(ProcessTable.from_processes([Process(*job) for job in jobs]), "Non-Preemptive")
+    processes = run_schedule([Process(*job) for job in jobs], "Non-Preemptive")
+    assert compute_metrics(table).as_dict() == compute_metrics(processes).as_dict()
+
+def test_report_values(jobs):
+    report = compute_metrics(run_schedule([Process(*job) for job in jobs], "Non-Preemptive"))
+    # A 0-4, B 4-7, C 7-8, 7 at 9-11
+    assert report.count == 4
+    assert report.waiting["mean"] == (0 + 3 + 5 + 0) / 4
+    assert report.turnaround["max"] == 6
+    assert report.busy_time == 10 and report.makespan == 11
+    assert math.isclose(report.cpu_utilization, 10 / 11)
+    assert sorted(report.by_priority) == [0, 1, 2]
+    assert report.by_priority[1].count == 2 and report.by_priority[1].makespan == 8
+
+def test_unfinished_rows_are_skipped(jobs):
+    processes = [Process(*job) for job in jobs]
+    run_schedule(processes[:2], "Preemptive")
+    report = compute_metrics(processes, by_priority=False)
+    assert report.count == 2 and report.by_priority == {}
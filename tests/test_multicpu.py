@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from schedcore import lane_utilization, simulate_multiprocessor, simulate_non_preemptive, simulate_preemptive
+
+def _run(jobs, cpus=2, **kwargs):
+    schedule = []
+    results = {job[0]: (start, end) for job, start, end in simulate_multiprocessor(jobs, schedule, cpus, **kwargs)}
+    return results, [[(s["pid"], s["start"], s["end"]) for s in lane] for lane in schedule]
+
+def test_one_cpu_matches_the_single_cpu_engines():
+    rng = random.Random(17)
+    for _ in range(200):
+        n = rng.randrange(1, 9)
+        jobs = sorted(((f"P{i}", float(rng.randrange(0, 20)), float(rng.randrange(1, 8)), priority)
+                       for i, priority in enumerate(rng.sample(range(50), n))), key=lambda job: job[1])
+        for preemptive, engine in ((True, simulate_preemptive), (False, simulate_non_preemptive)):
+            expected = {job[0]: (start, end) for job, start, end in engine(jobs)}
+            assert _run(jobs, 1, preemptive=preemptive)[0] == expected, (preemptive, jobs)
+
+def test_global_preempts_the_lowest_priority_cpu():
+    # C outranks both running jobs and takes B's CPU; B resumes when C is done
+    results, lanes = _run([("A", 0, 4, 2), ("B", 0, 4, 3), ("C", 1, 2, 1)])
+    assert results == {"A": (0, 4), "B": (0, 6), "C": (1, 3)}
+    assert lanes == [[("A", 0, 4)], [("B", 0, 1), ("C", 1, 3), ("B", 3, 6)]]
+    assert lane_utilization([[{"pid": p, "start": s, "end": e} for p, s, e in lane] for lane in lanes], 6) \
+        == [4 / 6, 1.0]
+
+def test_partitioned_migration_steals_queued_work():
+    # C is queued behind A on CPU 0; CPU 1 frees up at t = 1
+    jobs = [("A", 0, 5, 1), ("B", 0, 1, 2), ("C", 0, 3, 3)]
+    assert _run(jobs, partitioned=True)[0]["C"] == (1, 4)
+    assert _run(jobs, partitioned=True, migrate=False)[0]["C"] == (5, 8)
+
+def test_needs_one_lane_per_cpu():
+    with pytest.raises(ValueError):
+        list(simulate_multiprocessor([("A", 0, 1, 0)], cpus=0))
+    with pytest.raises(ValueError):
+        list(simulate_multiprocessor([("A", 0, 1, 0)], [[]], cpus=2))
@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from schedcore import OnlineScheduler, policy_for, simulate_policy
+
+MODES = ["Preemptive", "Non-Preemptive", "SJF", "SRTF", "Round Robin", "MLFQ"]
+
+def _replay(jobs, mode):
+    schedule = []
+    online = OnlineScheduler(mode, schedule)
+    for job in jobs:
+        online.submit(job)
+    results = {}
+    while (decision := online.next_decision()) is not None:
+        if decision.completed is not None:
+            job, start, end = decision.completed
+            results[job[0]] = (start, end)
+    return results, schedule
+
+def test_replay_matches_the_batch_engine():
+    rng = random.Random(22)
+    for _ in range(100):
+        n = rng.randrange(1, 9)
+        jobs = sorted(((f"P{i}", float(rng.randrange(0, 20)), float(rng.randrange(1, 8)), priority)
+                       for i, priority in enumerate(rng.sample(range(50), n))), key=lambda job: job[1])
+        for mode in MODES:
+            schedule = []
+            expected = {job[0]: (start, end) for job, start, end in simulate_policy(jobs, policy_for(mode), schedule)}
+            assert _replay(jobs, mode) == (expected, schedule), (mode, jobs)
+
+def test_live_submissions_as_the_clock_advances():
+    online = OnlineScheduler("Preemptive")
+    online.submit(("A", 0.0, 4.0, 2))
+    assert online.advance(1.0) == []
+    assert online.running[0] == "A"
+    online.submit(("B", 1.0, 1.0, 1))
+    assert online.next_event_time == 1.0
+    assert [(job[0], start, end) for job, start, end in online.advance(3.0)] == [("B", 1.0, 2.0)]
+    assert len(online) == 1
+    assert [(job[0], start, end) for job, start, end in online.advance(float("inf"))] == [("A", 0.0, 5.0)]
+    assert online.next_decision() is None
+
+def test_rejects_late_submissions_and_overhead():
+    online = OnlineScheduler()
+    online.advance(5.0)
+    with pytest.raises(ValueError):
+        online.submit(("A", 4.0, 1.0, 0))
+    with pytest.raises(ValueError):
+        online.advance(4.0)
+    with pytest.raises(ValueError):
+        OnlineScheduler(policy_for("SJF").with_overhead(switch=1.0))
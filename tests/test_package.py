@@ -0,0 +1,33 @@
+import subprocess
+import sys
+
+def test_import_leaves_heavy_modules_unloaded():
+    # The service, sweep, cache, export and snapshot modules load on first use
+    code = ("import sys, schedcore; print(' '.join(m for m in ('asyncio', 'concurrent.futures', 'json', "
+            "'hashlib', 'tempfile', 'schedcore.service', 'schedcore.sweep') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == ""
+
+def test_lazy_names_resolve():
+    import schedcore
+    from schedcore.service import serve
+    assert schedcore.serve is serve
+    assert "run_sweep" in dir(schedcore)
+    try:
+        schedcore.no_such_name
+    except AttributeError:
+        return
+    raise AssertionError("expected AttributeError")
+
+def test_star_import_includes_lazy_names():
+    namespace = {}
+    exec("from schedcore import *", namespace)
+    for name in ("run_sweep", "ScheduleCache", "serve", "export_schedule", "schedule_table", "Labels"):
+        assert name in namespace
+    assert "timeline" not in namespace
+
+def test_cli_import_leaves_heavy_modules_unloaded():
+    code = ("import sys, priorityschedulingCS; print(' '.join(m for m in ('asyncio', 'concurrent.futures', "
+            "'hashlib', 'schedcore.cache', 'schedcore.export', 'schedcore.snapshot') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == ""
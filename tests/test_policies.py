@@ -0,0 +1,38 @@
+import pytest
+
+from schedcore import MultilevelFeedbackQueue, RoundRobin, policy_for, simulate_policy
+
+def _run(jobs, policy):
+    schedule = []
+    results = {job[0]: (start, end) for job, start, end in simulate_policy(jobs, policy_for(policy), schedule)}
+    return results, [(s["pid"], s["start"], s["end"]) for s in schedule]
+
+def test_sjf_runs_the_shortest_ready_job_to_completion(jobs):
+    assert _run(jobs, "SJF")[0] == {"A": (0, 4), "B": (5, 8), "C": (4, 5), 7: (9, 11)}
+
+def test_srtf_preempts_for_a_shorter_remaining_time(jobs):
+    # B's remaining time only ties A's, so A keeps the CPU until C arrives
+    results, schedule = _run(jobs, "SRTF")
+    assert results == {"A": (0, 5), "B": (5, 8), "C": (2, 3), 7: (9, 11)}
+    assert schedule == [("A", 0, 2), ("C", 2, 3), ("A", 3, 5), ("B", 5, 8), ("Idle", 8, 9), (7, 9, 11)]
+
+def test_round_robin_takes_turns_within_a_priority():
+    results, schedule = _run([("A", 0, 5, 1), ("B", 1, 3, 1)], RoundRobin(2.0))
+    assert results == {"A": (0, 8), "B": (2, 7)}
+    assert schedule == [("A", 0, 2), ("B", 2, 4), ("A", 4, 6), ("B", 6, 7), ("A", 7, 8)]
+    # A higher priority class still preempts mid-quantum
+    assert _run([("A", 0, 4, 1), ("B", 1, 1, 0)], RoundRobin(2.0))[1] == [("A", 0, 1), ("B", 1, 2), ("A", 2, 5)]
+
+def test_mlfq_demotes_jobs_that_use_their_quantum():
+    # A drops to level 1 after one unit, so the new arrival B runs first
+    results, schedule = _run([("A", 0, 4, 1), ("B", 1, 1, 1)], MultilevelFeedbackQueue(levels=2, quantum=1.0))
+    assert results == {"A": (0, 5), "B": (1, 2)}
+    assert schedule == [("A", 0, 1), ("B", 1, 2), ("A", 2, 5)]
+
+def test_invalid_policy_options():
+    with pytest.raises(ValueError):
+        RoundRobin(0)
+    with pytest.raises(ValueError):
+        MultilevelFeedbackQueue(levels=0)
+    with pytest.raises(ValueError):
+        policy_for("FIFO")
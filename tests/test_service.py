@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+
+from schedcore.service import ScheduleService, _HTTPError, run_specs
+
+@pytest.mark.parametrize("body", [
+    b'{"jobs": [["A", NaN, 1, 1]]}',
+    b'{"jobs": [["A", "nan", 1, 1]]}',
+    b'{"jobs": [["A", 0, Infinity, 1]]}',
+    b'{"jobs": [["A", 0, 1, 1]], "aging": NaN}',
+    b'{"jobs": [["A", 0, 1, 1]], "switch_cost": Infinity}',
+    b'{"jobs": [["A", 0, 1, 1]], "modes": [[1]]}',
+    b'{"jobs": [["A", 0, 1, 1]], "modes": [{"a": 1}]}',
+])
+def test_parse_request_rejects_bad_input(body):
+    with pytest.raises(_HTTPError) as error:
+        ScheduleService().parse_request(body)
+    assert error.value.status == 400
+
+def test_run_specs_reports_unexpected_errors():
+    spec = ScheduleService().parse_request(b'{"jobs": [["A", 0, 1, 1]], "modes": ["SJF"]}')[0]
+    spec["chunk_size"] = None  # breaks encoding, not the workload
+    spec["per_job"] = True
+    status, message = run_specs([spec])[0]
+    assert status == "error" and "TypeError" in message
+
+def test_pending_counts_pool_work_until_it_finishes():
+    async def scenario():
+        service = ScheduleService(max_workers=0, batch_jobs=1)
+        await service.start()
+        try:
+            body = json.dumps({"jobs": [[f"P{i}", i, 1, i % 5] for i in range(20000)], "modes": ["Preemptive"]})
+            futures = [service.submit(spec) for spec in service.parse_request(body.encode())]
+            futures[0].cancel()
+            # The request gave up, but the simulation is still running
+            await asyncio.sleep(0)
+            assert service.pending == 1
+            for _ in range(500):
+                if not service.pending:
+                    break
+                await asyncio.sleep(0.01)
+            assert service.pending == 0
+        finally:
+            await service.close()
+    asyncio.run(scenario())
+
+def test_cancelled_batched_tasks_skip_the_pool():
+    async def scenario():
+        service = ScheduleService(max_workers=0, batch_window=0.01)
+        await service.start()
+        try:
+            future = service.submit(service.parse_request(b'{"jobs": [["A", 0, 1, 1]], "modes": ["SJF"]}')[0])
+            future.cancel()
+            assert service.pending == 1
+            await asyncio.sleep(0.05)
+            assert service.pending == 0
+        finally:
+            await service.close()
+    asyncio.run(scenario())
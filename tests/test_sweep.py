@@ -0,0 +1,16 @@
+from schedcore import RoundRobin, run_sweep, summarize, sweep_tasks
+
+def test_sweep_accepts_policy_instances(jobs):
+    modes = ["Preemptive", RoundRobin(1.0), RoundRobin(4.0)]
+    assert len(sweep_tasks({"w": jobs}, modes)) == 3
+    results = run_sweep({"w": jobs}, modes, max_workers=0)
+    assert [row["mode"] for row in results] == ["Preemptive", "RoundRobin(time_slice=1.0)",
+                                                "RoundRobin(time_slice=4.0)"]
+    assert len(summarize(results)) == 3
+
+def test_sweep_rejects_unknown_modes(jobs):
+    try:
+        sweep_tasks({"w": jobs}, ["FIFO"])
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
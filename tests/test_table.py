@@ -0,0 +1,68 @@
+import random
+import tracemalloc
+from array import array
+
+import pytest
+
+from schedcore import (Process, ProcessTable, ScheduleCancelled, run_schedule, schedule_table,
+                       schedule_table_resumable, snapshot_info)
+from schedcore import snapshot as snapshot_module
+from schedcore import table as table_module
+
+def _processes(seed, n=500):
+    rng = random.Random(seed)
+    return [Process(f"P{i}", float(rng.randrange(0, 200)), float(rng.randrange(1, 5)), rng.randrange(0, 6))
+            for i in range(n)]
+
+def _columns(table):
+    return [(table.label(i), table.start_time[i], table.completion_time[i], table.waiting_time[i])
+            for i in range(len(table))]
+
+@pytest.mark.parametrize("mode", ["Non-Preemptive", "Preemptive", "SRTF"])
+def test_unsorted_table_matches_process_list(monkeypatch, mode):
+    monkeypatch.setattr(table_module, "ORDER_BLOCK", 64)
+    processes = _processes(1)
+    table = schedule_table(ProcessTable.from_processes(processes), mode)
+    run_schedule(processes, mode)
+    by_pid = {p.pid: (p.pid, p.start_time, p.completion_time, p.waiting_time) for p in processes}
+    assert _columns(table) == [by_pid[table.label(i)] for i in range(len(table))]
+
+def test_table_size_and_remaining_time():
+    table = ProcessTable.from_processes(_processes(2, 10))
+    text = sum(len(p.pid) for p in _processes(2, 10))
+    assert table.nbytes() == 56 * len(table) + text
+    assert table.pid == array("I")
+    assert table[0].remaining_time == table[0].burst_time
+    schedule_table(table, "Preemptive")
+    assert table[0].remaining_time == 0.0
+
+def test_resumed_snapshot_matches_full_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(table_module, "ORDER_BLOCK", 64)
+    monkeypatch.setattr(snapshot_module, "PROGRESS_INTERVAL", 200)
+    path = str(tmp_path / "run.snap")
+    expected = _columns(schedule_table(ProcessTable.from_processes(_processes(3)), "Preemptive"))
+
+    def cancel(done, total):
+        if done == 200:
+            raise ScheduleCancelled()
+
+    table = ProcessTable.from_processes(_processes(3))
+    with pytest.raises(ScheduleCancelled):
+        schedule_table_resumable(table, "Preemptive", path, progress=cancel, interval=16)
+    assert snapshot_info(path)["snapshots"] > 0
+    table = ProcessTable.from_processes(_processes(3))
+    assert _columns(schedule_table_resumable(table, "Preemptive", path, interval=16)) == expected
+
+def test_labelled_table_memory():
+    tracemalloc.start()
+    try:
+        table = ProcessTable([])
+        for i in range(20000):
+            table.append(f"P{i}", float(i), 1.0, i % 4)
+        used = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert table.nbytes() < 64 * len(table)
+    # Array and buffer over-allocation aside, nbytes is the real footprint
+    assert used < 1.15 * table.nbytes()
+    assert table.label(12345) == "P12345" and list(table.labels)[-1] == "P19999"
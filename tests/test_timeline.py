@@ -0,0 +1,56 @@
+import pytest
+
+from schedcore import Timeline, TimelineIndex
+
+def _timeline(segments):
+    timeline = Timeline()
+    for pid, start, end in segments:
+        timeline.add(pid, start, end)
+    return timeline
+
+def _dicts(segments):
+    return [{"pid": pid, "start": start, "end": end} for pid, start, end in segments]
+
+def test_bars_keep_wide_segments_after_narrow_ones():
+    index = TimelineIndex(_timeline([("A", 0, 0.1), ("B", 0.1, 100), ("C", 100, 200)]))
+    assert list(index.bars(0, 200, 1)) == [(0.0, 0.1, "A"), (0.1, 100.0, "B"), (100.0, 200.0, "C")]
+
+def test_bars_merge_runs_of_narrow_segments():
+    segments = [(f"P{i}", i * 0.1, (i + 1) * 0.1) for i in range(30)] + [("W", 3.0, 10.0)]
+    bars = list(TimelineIndex(_dicts(segments)).bars(0, 10, 1))
+    assert [pid for _, _, pid in bars] == [None, None, None, "W"]
+    assert bars[-1][:2] == (3.0, 10.0)
+    assert bars[0][0] == 0.0 and bars[2][1] == bars[3][0]
+def test_add_merges_consecutive_segments_of_a_pid():
+    timeline = _timeline([("A", 0, 1), ("A", 1, 2), ("B", 2, 3), ("A", 3, 4), ("C", 4, 4)])
+    assert list(timeline) == _dicts([("A", 0, 2), ("B", 2, 3), ("A", 3, 4)])
+    assert timeline.labels == ["A", "B"]
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_save_load_round_trip(tmp_path, use_mmap):
+    segments = [(f"P{i % 7}", float(i), i + 0.5) for i in range(1000)] + [(3, 1000.0, 1001.0)]
+    path = str(tmp_path / "run.tl")
+    _timeline(segments).save(path)
+    loaded = Timeline.load(path, use_mmap=use_mmap)
+    try:
+        assert list(loaded) == _dicts(segments)
+        assert loaded.pid_at(1000) == 3
+        assert list(loaded.slice(10.2, 12)) == _dicts(segments[10:12])
+    finally:
+        loaded.close()
+
+def test_load_empty_and_invalid_files(tmp_path):
+    path = tmp_path / "empty.tl"
+    Timeline().save(str(path))
+    assert len(Timeline.load(str(path))) == 0
+    path.write_bytes(b"not a timeline")
+    with pytest.raises(ValueError):
+        Timeline.load(str(path))
+
+def test_slice_keeps_segments_overlapping_the_window():
+    timeline = _timeline([("A", 0, 2), ("B", 2, 5), ("C", 5, 6)])
+    part = timeline.slice(1, 5)
+    assert list(part) == _dicts([("A", 0, 2), ("B", 2, 5)])
+    # The slice is independent of the original
+    part.add("D", 5, 7)
+    assert len(timeline) == 3 and list(timeline.slice(6, 10)) == []
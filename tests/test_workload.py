@@ -0,0 +1,45 @@
+import io
+
+import pytest
+
+from schedcore import RoundRobin, MultilevelFeedbackQueue, OnlineScheduler, parse_job
+from schedcore.workload import iter_jobs
+
+@pytest.mark.parametrize("field", ["arrival", "burst"])
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", float("nan"), float("inf")])
+def test_parse_job_rejects_non_finite_times(field, value):
+    record = {"pid": "P1", "arrival": 0, "burst": 5, "priority": 1, field: value}
+    with pytest.raises(ValueError):
+        parse_job(record, 1)
+
+@pytest.mark.parametrize("value", ["nan", "inf", float("nan"), float("inf")])
+def test_parse_job_rejects_non_finite_priority(value):
+    with pytest.raises(ValueError):
+        parse_job({"pid": "P1", "arrival": 0, "burst": 5, "priority": value}, 1)
+
+def test_nan_arrival_in_jsonl_trace_is_rejected():
+    trace = io.StringIO('{"pid": "A", "arrival": 0, "burst": 2, "priority": 1}\n'
+                        '{"pid": "B", "arrival": NaN, "burst": 2, "priority": 1}\n')
+    with pytest.raises(ValueError, match="line 2"):
+        list(iter_jobs(trace, "jsonl"))
+
+@pytest.mark.parametrize("quantum", [float("nan"), float("inf")])
+def test_policies_reject_non_finite_quantum(quantum):
+    with pytest.raises(ValueError):
+        RoundRobin(quantum)
+    with pytest.raises(ValueError):
+        MultilevelFeedbackQueue(quantum=quantum)
+
+@pytest.mark.parametrize("cost", [float("nan"), float("inf")])
+def test_overhead_rejects_non_finite_costs(cost):
+    with pytest.raises(ValueError):
+        RoundRobin().with_overhead(switch=cost)
+    with pytest.raises(ValueError):
+        RoundRobin().with_overhead(dispatch=cost)
+
+def test_online_submit_rejects_non_finite_jobs():
+    scheduler = OnlineScheduler()
+    with pytest.raises(ValueError):
+        scheduler.submit(("A", float("nan"), 1.0, 1))
+    with pytest.raises(ValueError):
+        scheduler.submit(("A", 0.0, float("inf"), 1))